@@ -0,0 +1,62 @@
+"""Замер времени импорта main.py (python -X importtime)
+
+Запуск из каталога lab1:
+    python benchmarks/import_time.py [--max-ms 500] [--repeat 5]
+
+Завершается с кодом 1, если при импорте загружаются тяжелые библиотеки
+(matplotlib, scipy, pandas) или медианное время импорта превышает порог.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Библиотеки, которые должны загружаться только на этапах, где они нужны
+HEAVY_MODULES = ('matplotlib', 'scipy', 'pandas')
+
+def measure_import(module: str = 'main') -> Tuple[float, Dict[str, float]]:
+    """Время импорта модуля (мс) и накопленное время импорта каждого загруженного модуля"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        modules[name.strip()] = int(cumulative_us) / 1000
+    return modules[module], modules
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замер времени импорта main.py")
+    parser.add_argument('--max-ms', type=float, default=500, help="допустимое медианное время импорта, мс")
+    parser.add_argument('--repeat', type=int, default=5, help="число замеров")
+    parser.add_argument('--top', type=int, default=10, help="число самых медленных модулей в отчете")
+    args = parser.parse_args(argv)
+    
+    timings = []
+    for _ in range(args.repeat):
+        total_ms, modules = measure_import()
+        timings.append(total_ms)
+    median_ms = statistics.median(timings)
+    
+    print(f"Импорт main: медиана {median_ms:.1f} мс (мин. {min(timings):.1f}, макс. {max(timings):.1f})")
+    top_level = {name: ms for name, ms in modules.items() if '.' not in name and name != 'main'}
+    for name, ms in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<30} {ms:>8.1f} мс")
+    
+    failed = False
+    heavy = sorted({name.split('.')[0] for name in modules} & set(HEAVY_MODULES))
+    if heavy:
+        print(f"ОШИБКА: при импорте загружаются тяжелые библиотеки: {', '.join(heavy)}")
+        failed = True
+    if median_ms > args.max_ms:
+        print(f"ОШИБКА: время импорта {median_ms:.1f} мс превышает порог {args.max_ms:.1f} мс")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""Набор бенчмарков для горячих путей: статистика, генерация, чтение данных, гистограмма
+
+Запуск из каталога lab1:
+    python benchmarks/run.py                                 # размеры 10^3..10^6
+    python benchmarks/run.py --sizes 1000 100000 100000000   # до 10^8
+    python benchmarks/run.py --save-baseline                 # сохранить базовую линию
+    python benchmarks/run.py --cases statistics.mean io.read_data
+
+Для каждого случая и размера записываются лучшее время из --repeat запусков и
+пиковое выделение памяти (tracemalloc) в JSON (--output). Если есть базовая
+линия (--baseline), результаты сравниваются с ней; замедление или рост памяти
+больше допуска (--tolerance) считается регрессией, и скрипт завершается с кодом 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, '..', 'src'))
+
+from statistics import StatisticsCalculator
+from distribution import DistributionApproximator
+from visualization import Visualizer
+from utils import read_data
+from rolling import RollingStatistics
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6]
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_DIR, 'results.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+# Параметры гиперэкспоненциального закона, близкие к data/numbers.txt
+T1, T2, Q = 48.665, 7.181, 0.3
+
+def _make_data(size: int) -> np.ndarray:
+    return DistributionApproximator.generate_hyperexponential_sequence(size, T1, T2, Q, seed=size)
+
+def _write_text(data: np.ndarray, directory: str) -> str:
+    path = os.path.join(directory, f'numbers_{len(data)}.txt')
+    np.savetxt(path, data, fmt='%.3f')
+    return path
+
+def _read_text(path: str) -> Callable:
+    return lambda: read_data(path, use_cache=False)
+
+def _read_cached(path: str) -> Callable:
+    read_data(path)  # создание кэша до замера
+    return lambda: np.asarray(read_data(path)).sum()
+
+# Случай: имя -> функция (данные, временный каталог) -> вызываемый объект для замера
+CASES: Dict[str, Callable[[np.ndarray, str], Callable]] = {
+    'statistics.mean': lambda data, _: lambda: StatisticsCalculator.calculate_mean(data),
+    'statistics.variance': lambda data, _: lambda: StatisticsCalculator.calculate_variance(data),
+    'statistics.std': lambda data, _: lambda: StatisticsCalculator.calculate_std(data),
+    'statistics.variation': lambda data, _: lambda: StatisticsCalculator.calculate_variation_coefficient(data),
+    'statistics.confidence_interval': lambda data, _: lambda: StatisticsCalculator.calculate_confidence_interval(data, 0.95),
+    'statistics.autocorrelation': lambda data, _: lambda: StatisticsCalculator.calculate_autocorrelation(data, 10),
+    'statistics.prefix_characteristics':
+        lambda data, _: lambda: StatisticsCalculator.calculate_prefix_characteristics(data, [10, 100, len(data)]),
+    'statistics.rolling':
+        lambda data, _: lambda: RollingStatistics.calculate(data, min(1000, len(data)), max_lag=3),
+    'statistics.cross_correlation':
+        lambda data, _: lambda: StatisticsCalculator.calculate_cross_correlation(
+            [data, np.roll(data, 1), data[::-1], np.sqrt(data)], 10),
+    'generation.hyperexponential':
+        lambda data, _: lambda: DistributionApproximator.generate_hyperexponential_sequence(len(data), T1, T2, Q, seed=0),
+    'fitting.hyperexponential_em':
+        lambda data, _: lambda: DistributionApproximator.fit_hyperexponential_em(data),
+    'io.read_data': lambda data, directory: _read_text(_write_text(data, directory)),
+    'io.read_data_cached': lambda data, directory: _read_cached(_write_text(data, directory)),
+    'histogram.intervals': lambda data, _: lambda: Visualizer.calculate_histogram_intervals(data, 18),
+}
+
+def measure(function: Callable, repeat: int) -> Tuple[float, int]:
+    """Лучшее время из repeat запусков и пиковое выделение памяти за один запуск"""
+    function()  # прогрев: отложенные импорты, кэши
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak
+
+def run(cases: List[str], sizes: List[int], repeat: int) -> List[Dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            data = _make_data(size)
+            for case in cases:
+                seconds, peak = measure(CASES[case](data, directory), repeat)
+                results.append({'case': case, 'size': size, 'seconds': seconds, 'peak_bytes': peak})
+                print(f"{case:<36} {size:>11} {seconds * 1000:>12.3f} мс {peak / 2**20:>10.2f} МиБ")
+            del data
+    return results
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Регрессии относительно базовой линии (время и память больше допуска)"""
+    reference = {(item['case'], item['size']): item for item in baseline}
+    regressions = []
+    for item in results:
+        base = reference.get((item['case'], item['size']))
+        if base is None:
+            continue
+        for key, label in (('seconds', 'время'), ('peak_bytes', 'память')):
+            if base[key] > 0 and item[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{item['case']} (n={item['size']}): {label} "
+                                   f"{item[key] / base[key]:.2f}x от базовой линии")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки горячих путей анализа")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="размеры данных")
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=sorted(CASES), help="случаи для замера")
+    parser.add_argument('--repeat', type=int, default=3, help="число замеров времени (берется лучший)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="JSON с результатами")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="JSON базовой линии для сравнения")
+    parser.add_argument('--save-baseline', action='store_true', help="сохранить результаты как базовую линию")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="допустимый относительный рост (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    
+    print(f"{'Случай':<36} {'Размер':>11} {'Время':>15} {'Пик памяти':>14}")
+    results = run(args.cases, sorted(args.sizes), args.repeat)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nРезультаты: {args.output}")
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Базовая линия сохранена: {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("Базовая линия не найдена, сравнение пропущено (используйте --save-baseline)")
+        return 0
+    
+    with open(args.baseline) as file:
+        regressions = compare(results, json.load(file)['results'], args.tolerance)
+    if regressions:
+        print("РЕГРЕССИИ:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("Регрессий относительно базовой линии нет")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
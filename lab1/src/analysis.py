@@ -0,0 +1,148 @@
+import numpy as np
+from typing import Dict, Any, Callable, Optional, Sequence, Tuple, Union
+from statistics import StatisticsCalculator
+from distribution import DistributionApproximator, FIT_METHODS
+from visualization import Visualizer
+from goodness_of_fit import GoodnessOfFit
+from utils import get_sample_sizes
+from profiling import Profiler
+from results import CharacteristicsTable
+from cache import ResultCache
+
+# Характеристики ФОРМЫ 1 (без доверительных интервалов)
+FORM1_CHARACTERISTICS = ['mean', 'variance', 'std', 'variation']
+CONFIDENCE_LEVELS = (0.9, 0.95, 0.99)
+
+def calculate_generated_statistics(reference_sample: np.ndarray, generated: np.ndarray, histogram: Tuple,
+                                   max_lag: int = 10, bins: int = 18) -> Dict[str, Any]:
+    """Характеристики сгенерированной последовательности и ее сравнение с исходной"""
+    return {
+        'generated_autocorrelation': StatisticsCalculator.calculate_autocorrelation(generated, max_lag),
+        'generated_autocorrelation_bound': StatisticsCalculator.calculate_autocorrelation_bounds(len(generated)),
+        'generated_histogram': Visualizer.calculate_histogram_intervals(generated, bins),
+        'correlation': StatisticsCalculator.calculate_correlation(reference_sample, generated),
+        'goodness_of_fit': GoodnessOfFit.compare(reference_sample, generated, *histogram[:2]),
+        'generated_characteristics': {
+            'mean': StatisticsCalculator.calculate_mean(generated),
+            'variance': StatisticsCalculator.calculate_variance(generated),
+            'std': StatisticsCalculator.calculate_std(generated),
+            'variation': StatisticsCalculator.calculate_variation_coefficient(generated),
+        },
+    }
+
+def _cached_stage(cache: Optional[ResultCache], data_digest: Optional[str], stage: str, params: Dict[str, Any],
+                  compute: Callable[[], Any]) -> Any:
+    """Результат этапа из кэша (если он задан и результат воспроизводим) или вычисленный compute()"""
+    if cache is None or data_digest is None:
+        return compute()
+    return cache.get_or_compute(ResultCache.key(data_digest, stage, params), compute)
+
+def analyze_sequence(data: np.ndarray, sample_sizes: Optional[Sequence[int]] = None,
+                     confidences: Sequence[float] = CONFIDENCE_LEVELS, max_lag: int = 10, bins: int = 18,
+                     q: float = 0.3, seed: Optional[Union[int, np.random.SeedSequence]] = None,
+                     fit: str = 'moments', cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+    """Численная часть анализа: ФОРМА 1, автокорреляция, гистограмма, аппроксимация
+    
+    Эталонной считается выборка наибольшего объема из sample_sizes. Размеры
+    больше длины последовательности отбрасываются (result['skipped_sizes']), и
+    эталоном тогда служит вся последовательность. Если закон
+    распределения гиперэкспоненциальный, генерируется последовательность того же
+    объема и рассчитываются ее характеристики. fit - метод оценки параметров
+    гиперэкспоненциального закона: 'moments' (по моментам с заданным q) или
+    'em' (t1, t2 и q по данным методом EM).
+    
+    cache - кэш результатов этапов: каждый этап ищется по хэшу данных и своим
+    параметрам, поэтому при изменении параметра пересчитываются только
+    зависящие от него этапы. Генерация кэшируется только при заданном seed.
+    """
+    if fit not in FIT_METHODS:
+        raise ValueError(f"Неизвестный метод оценки параметров: {fit}")
+    
+    sample_sizes = list(get_sample_sizes() if sample_sizes is None else sample_sizes)
+    skipped_sizes = [n for n in sample_sizes if n > len(data)]
+    if skipped_sizes:
+        sample_sizes = [n for n in sample_sizes if n <= len(data)]
+        if len(data) not in sample_sizes:
+            sample_sizes.append(len(data))
+    reference_size = max(sample_sizes)
+    reference_index = sample_sizes.index(reference_size)
+    reference_sample = np.asarray(data[:reference_size], dtype=float)
+    
+    digest = None
+    if cache is not None:
+        with Profiler.stage('analysis.cache_key'):
+            digest = ResultCache.data_digest(data)
+    
+    # ФОРМА 1 для всех размеров выборки
+    with Profiler.stage('analysis.form1'):
+        keys = FORM1_CHARACTERISTICS + [StatisticsCalculator.confidence_key(c) for c in confidences]
+        form1 = _cached_stage(cache, digest, 'form1', {'sample_sizes': sample_sizes, 'confidences': confidences},
+                              lambda: CharacteristicsTable.from_columns(
+                                  StatisticsCalculator.calculate_prefix_characteristics(data, sample_sizes, confidences),
+                                  keys))
+        reference = form1.row(reference_index)
+        relative = form1.relative_deviations(reference_index)
+    
+    with Profiler.stage('analysis.autocorrelation'):
+        autocorrelation, autocorrelation_bound = _cached_stage(
+            cache, digest, 'autocorrelation', {'reference_size': reference_size, 'max_lag': max_lag},
+            lambda: (StatisticsCalculator.calculate_autocorrelation(reference_sample, max_lag),
+                     StatisticsCalculator.calculate_autocorrelation_bounds(len(reference_sample))))
+    
+    with Profiler.stage('analysis.histogram'):
+        histogram = _cached_stage(cache, digest, 'histogram', {'reference_size': reference_size, 'bins': bins},
+                                  lambda: Visualizer.calculate_histogram_intervals(reference_sample, bins))
+    
+    result = {
+        'count': len(data),
+        'sample_sizes': sample_sizes,
+        'skipped_sizes': skipped_sizes,
+        'reference_size': reference_size,
+        'form1': form1,
+        'relative': relative,
+        'reference': reference,
+        'autocorrelation': autocorrelation,
+        'autocorrelation_bound': autocorrelation_bound,
+        'histogram': histogram,
+        'distribution_type': DistributionApproximator.determine_distribution_type(reference['variation']),
+    }
+    
+    if result['distribution_type'] == "гипоэкспоненциальный" and reference['variation'] > 0:
+        with Profiler.stage('analysis.fitting'):
+            result['erlang'] = DistributionApproximator.erlang_parameters(reference['mean'], reference['variation'])
+            result['phase_means'] = DistributionApproximator.hypoexponential_parameters(reference['mean'],
+                                                                                        reference['variation'])
+    
+    if result['distribution_type'] != "гиперэкспоненциальный":
+        return result
+    
+    with Profiler.stage('analysis.fitting'):
+        if fit == 'em':
+            t1, t2, q = _cached_stage(cache, digest, 'fitting', {'reference_size': reference_size, 'fit': fit, 'q': q},
+                                      lambda: DistributionApproximator.fit_hyperexponential_em(reference_sample, q))
+        else:
+            t1, t2 = DistributionApproximator.hyperexponential_parameters(reference['mean'], reference['variation'], q)
+    
+    # Сгенерированная последовательность воспроизводима только при заданном зерне
+    reproducible = isinstance(seed, (int, np.integer, np.random.SeedSequence))
+    generation_params = {'reference_size': reference_size, 't1': t1, 't2': t2, 'q': q,
+                         'seed': seed if reproducible else None}
+    
+    with Profiler.stage('analysis.generation'):
+        generated = _cached_stage(cache, digest if reproducible else None, 'generation', generation_params,
+                                  lambda: DistributionApproximator.generate_hyperexponential_sequence(
+                                      len(reference_sample), t1, t2, q, seed))
+    
+    with Profiler.stage('analysis.generated_statistics'):
+        result.update(_cached_stage(cache, digest if reproducible else None, 'generated_statistics',
+                                    dict(generation_params, max_lag=max_lag, bins=bins),
+                                    lambda: calculate_generated_statistics(reference_sample, generated, histogram,
+                                                                           max_lag, bins)))
+        result.update({
+            't1': t1,
+            't2': t2,
+            'q': q,
+            'fit': fit,
+            'generated': generated,
+        })
+    return result
\ No newline at end of file
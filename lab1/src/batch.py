@@ -0,0 +1,110 @@
+import csv
+import glob
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
+from utils import read_data, CACHE_SUFFIX
+from analysis import analyze_sequence
+from results import CharacteristicsTable
+from profiling import Profiler
+
+# Расширения файлов, которые берутся из каталога в пакетном режиме
+DATA_EXTENSIONS = ('.txt', '.npy')
+
+def find_input_files(path: str) -> List[str]:
+    """Список файлов для пакетного анализа: все файлы данных каталога или файлы по шаблону
+    
+    Бинарные кэши, которые read_data создает рядом с исходными файлами, пропускаются.
+    """
+    if os.path.isdir(path):
+        files = [os.path.join(path, name) for name in os.listdir(path) if name.endswith(DATA_EXTENSIONS)]
+    else:
+        files = [name for name in glob.glob(path, recursive=True) if os.path.isfile(name)]
+    return sorted(name for name in files if not name.endswith(CACHE_SUFFIX))
+
+def summarize_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Строка сводной таблицы по результатам analyze_sequence"""
+    row = {'count': result['count'], 'reference_size': result['reference_size'],
+           'skipped_sizes': ' '.join(str(n) for n in result['skipped_sizes'])}
+    row.update(result['reference'])
+    for lag, acf in enumerate(result['autocorrelation'], 1):
+        row[f'acf_{lag}'] = acf
+    row['distribution_type'] = result['distribution_type']
+    
+    if 'generated' in result:
+        row['t1'] = result['t1']
+        row['t2'] = result['t2']
+        row['q'] = result['q']
+        row['correlation'] = result['correlation']
+        row.update(result['goodness_of_fit'])
+        for key, value in result['generated_characteristics'].items():
+            row[f'generated_{key}'] = value
+    return row
+
+def analyze_file(file_path: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[CharacteristicsTable]]:
+    """Анализ одного файла: строка сводной таблицы и таблица ФОРМЫ 1
+    
+    Ошибка записывается в строку результата (таблица при этом None), а не прерывает пакет.
+    """
+    row = {'file': file_path, 'status': 'ok', 'error': ''}
+    table = None
+    try:
+        data = read_data(file_path)
+        if len(data) == 0:
+            raise ValueError("файл не содержит данных")
+        result = analyze_sequence(data, **params)
+        row.update(summarize_analysis(result))
+        table = result['form1']
+    except Exception as e:
+        row.update({'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+    return row, table
+
+def write_table(rows: List[Dict[str, Any]], output_path: str):
+    """Запись сводной таблицы в CSV (объединение столбцов всех строк)"""
+    columns = []
+    for row in rows:
+        columns.extend(key for key in row if key not in columns)
+    
+    with open(output_path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def run_batch(path: str, output_path: str, workers: Optional[int] = None, seed: Optional[int] = None,
+              table_path: Optional[str] = None, **params) -> List[Dict[str, Any]]:
+    """Пакетный анализ файлов в пуле процессов со сводной таблицей результатов
+    
+    path - каталог или шаблон glob; workers - число процессов (по умолчанию по числу ядер).
+    Каждый файл получает независимое зерно генерации, производное от seed
+    (без seed генерация не воспроизводима и не кэшируется).
+    table_path - файл для объединенной таблицы ФОРМЫ 1 всех файлов (столбец
+    source - имя файла), формат по расширению (CharacteristicsTable.export).
+    """
+    if table_path:
+        CharacteristicsTable.check_export_path(table_path)
+    files = find_input_files(path)
+    seeds = np.random.SeedSequence(seed).spawn(len(files)) if seed is not None else [None] * len(files)
+    rows = []
+    tables = {}
+    
+    if files:
+        with Profiler.stage('batch.analysis'), ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(files))) as executor:
+            futures = {executor.submit(analyze_file, file_path, dict(params, seed=file_seed)): file_path
+                       for file_path, file_seed in zip(files, seeds)}
+            for future in as_completed(futures):
+                try:
+                    row, table = future.result()
+                    rows.append(row)
+                    if table is not None:
+                        tables[row['file']] = table
+                except Exception as e:  # например, аварийное завершение процесса
+                    rows.append({'file': futures[future], 'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+    
+    rows.sort(key=lambda row: row['file'])
+    with Profiler.stage('batch.export'):
+        write_table(rows, output_path)
+        if table_path and tables:
+            names = sorted(tables)
+            CharacteristicsTable.concatenate([tables[name] for name in names], names).export(table_path)
+    return rows
\ No newline at end of file
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Версия формата записей: изменение делает недействительными все прежние записи
+CACHE_VERSION = 1
+CACHE_EXTENSION = '.pkl'
+DEFAULT_CACHE_DIR = '.analysis_cache'
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+def _canonical(value: Any) -> Any:
+    """Приведение параметра к виду, однозначно сериализуемому в JSON"""
+    if isinstance(value, np.random.SeedSequence):
+        return {'entropy': _canonical(value.entropy), 'spawn_key': list(value.spawn_key)}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items())}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Параметр типа {type(value).__name__} не может входить в ключ кэша")
+
+class ResultCache:
+    """Дисковый кэш результатов этапов анализа с адресацией по содержимому
+    
+    Ключ записи - SHA-256 от хэша данных, имени этапа и параметров этапа, поэтому
+    изменение данных или любого параметра дает новый ключ, а прежние записи
+    вытесняются со временем. Суммарный размер записей ограничен max_bytes: при
+    превышении удаляются записи, к которым дольше всего не обращались (время
+    изменения файла обновляется при каждом чтении). Каталог обходится один раз при
+    первой записи, далее размер ведется по записанным файлам, и полный обход
+    выполняется только при превышении предела.
+    """
+    
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total = None  # суммарный размер записей, известный без обхода каталога
+    
+    @staticmethod
+    def data_digest(data: np.ndarray) -> str:
+        """Хэш содержимого последовательности (значения float64 и длина)"""
+        values = np.ascontiguousarray(data, dtype=np.float64)
+        digest = hashlib.sha256(str(values.shape).encode())
+        digest.update(memoryview(values).cast('B'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def key(data_digest: str, stage: str, params: Dict[str, Any]) -> str:
+        """Ключ записи этапа stage для данных с хэшем data_digest и параметров params"""
+        description = json.dumps([CACHE_VERSION, data_digest, stage, _canonical(params)], sort_keys=True)
+        return hashlib.sha256(description.encode()).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + CACHE_EXTENSION)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Сохраненный результат или None; поврежденная запись удаляется"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, ImportError):
+            # ImportError - запись ссылается на модуль или класс, которого больше нет
+            self._remove(path)
+            self.misses += 1
+            return None
+        
+        try:
+            os.utime(path)  # отметка последнего обращения для вытеснения
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+    
+    def put(self, key: str, value: Any):
+        """Атомарная запись результата с последующим вытеснением по размеру; ошибки записи не критичны"""
+        path = self._path(key)
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(temp_path)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)
+        except OSError:
+            if temp_path is not None:
+                self._remove(temp_path)
+            return
+        
+        if self._total is None:
+            self._total = self.size()
+        else:
+            self._total += size - previous
+        if self._total > self.max_bytes:
+            self.evict()
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Результат из кэша или вычисленный compute() с сохранением"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """Записи кэша: (время последнего обращения, размер, путь)"""
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(CACHE_EXTENSION):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # удалена другим процессом
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+    
+    def size(self) -> int:
+        """Суммарный размер записей в байтах"""
+        return sum(size for _, size, _ in self.entries())
+    
+    def evict(self):
+        """Удаление давно не использованных записей, пока размер превышает max_bytes"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+        self._total = total
+    
+    def clear(self):
+        """Удаление всех записей"""
+        for _, _, path in self.entries():
+            self._remove(path)
+        self._total = 0
+    
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
\ No newline at end of file
@@ -1,7 +1,12 @@
 import numpy as np
-from typing import Tuple
+from typing import Iterator, Optional, Tuple, Union
 from statistics import StatisticsCalculator
 
+# Число логарифмических интервалов на декаду при сжатии данных для EM-оценки
+EM_BINS_PER_DECADE = 200
+# Методы оценки параметров закона распределения
+FIT_METHODS = ('moments', 'em')
+
 class DistributionApproximator:
     """Класс для аппроксимации законов распределения"""
     
@@ -31,18 +36,155 @@ class DistributionApproximator:
         return t1, t2
     
     @staticmethod
-    def generate_hyperexponential_sequence(size: int, t1: float, t2: float, q: float = 0.3) -> np.ndarray:
-        """Генерация последовательности по гиперэкспоненциальному закону"""
-        sequence = []
+    def erlang_parameters(mean: float, variation_coefficient: float) -> Tuple[int, float]:
+        """Параметры закона Эрланга по моментам: число фаз k и среднее одной фазы"""
+        k = max(1, int(round(1 / variation_coefficient**2))) if variation_coefficient > 0 else 1
+        return k, mean / k
+    
+    @staticmethod
+    def hypoexponential_parameters(mean: float, variation_coefficient: float) -> np.ndarray:
+        """Средние фаз гипоэкспоненциального закона с заданными средним и коэффициентом вариации (v <= 1)
+        
+        Используется k = ceil(1/v^2) последовательных фаз: k-1 фаза со средним a и
+        одна со средним b, где (k-1)a + b = mean и (k-1)a^2 + b^2 = (v * mean)^2.
+        При v^2 = 1/k закон совпадает с законом Эрланга.
+        """
+        v = variation_coefficient
+        if not 0 < v <= 1:
+            raise ValueError("Гипоэкспоненциальный закон требует 0 < v <= 1")
+        
+        k = max(2, int(np.ceil(1 / v**2 - 1e-12)))
+        s = np.sqrt(max((k - 1) * (k * v**2 - 1), 0.0))
+        a = mean * (k - 1 + s) / (k * (k - 1))
+        b = mean * (1 - s) / k
+        return np.append(np.full(k - 1, a), b)
+    
+    @staticmethod
+    def _compress(data: np.ndarray, bins_per_decade: Optional[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Сжатие выборки в точки логарифмической сетки: (представители, веса, суммы значений)
+        
+        Представитель интервала - среднее попавших в него значений; нули образуют
+        отдельную точку. Без bins_per_decade возвращаются исходные значения.
+        """
+        data = np.asarray(data, dtype=float).ravel()
+        if np.any(data < 0):
+            raise ValueError("Оценка параметров требует неотрицательных значений")
+        if bins_per_decade is None:
+            return data, np.ones(len(data)), data
+        
+        positive = data[data > 0]
+        zeros = len(data) - len(positive)
+        indices = np.floor(np.log10(positive) * bins_per_decade).astype(np.int64)
+        indices -= indices.min(initial=0)
+        weights = np.bincount(indices).astype(float)
+        sums = np.bincount(indices, weights=positive)
+        occupied = weights > 0
+        weights, sums = weights[occupied], sums[occupied]
+        if zeros:
+            weights = np.append(weights, zeros)
+            sums = np.append(sums, 0.0)
+        return sums / weights, weights, sums
+    
+    @staticmethod
+    def fit_hyperexponential_em(data: np.ndarray, q: float = 0.3, max_iter: int = 5000, tol: float = 1e-10,
+                                bins_per_decade: Optional[int] = EM_BINS_PER_DECADE) -> Tuple[float, float, float]:
+        """Оценка параметров t1, t2, q гиперэкспоненциального закона методом EM по данным
+        
+        Начальное приближение - оценка по моментам (hyperexponential_parameters)
+        с вероятностью q. Данные предварительно сжимаются в точки логарифмической
+        сетки (bins_per_decade интервалов на декаду, None - без сжатия), поэтому
+        итерации выполняются над тысячами точек независимо от объема выборки.
+        Итерации прекращаются, когда относительный прирост логарифма
+        правдоподобия становится меньше tol. Возвращает (t1, t2, q), t1 >= t2.
+        """
+        values, weights, sums = DistributionApproximator._compress(data, bins_per_decade)
+        total = weights.sum()
+        if total == 0:
+            raise ValueError("Нет данных для оценки параметров")
+        mean = sums.sum() / total
+        if mean == 0:
+            raise ValueError("Оценка параметров невозможна для нулевой последовательности")
+        variance = np.sum(weights * (values - mean)**2) / total
+        v = np.sqrt(variance) / mean
         
-        for _ in range(size):
-            r1, r2 = np.random.random(), np.random.random()
+        # Начальное приближение по моментам; при v <= 1 - симметричный разнос фаз
+        if v > 1:
+            q = min(q, 1 / (v**2 + 1))  # половина допустимого q: t2 остается положительным
+            t1, t2 = DistributionApproximator.hyperexponential_parameters(mean, v, q)
+        else:
+            q, t1, t2 = 0.5, 1.5 * mean, 0.5 * mean
+        
+        log_likelihood = -np.inf
+        for _ in range(max_iter):
+            # E-шаг: вероятность принадлежности первой фазе (в логарифмах)
+            log_first = np.log(q) - np.log(t1) - values / t1
+            log_second = np.log1p(-q) - np.log(t2) - values / t2
+            difference = np.clip(log_second - log_first, -700, 700)
+            responsibility = 1 / (1 + np.exp(difference))
             
-            if r1 < q:
-                x = t1 * (-np.log(1 - r2))
-            else:
-                x = t2 * (-np.log(1 - r2))
+            # M-шаг: взвешенные доли и средние фаз
+            first_weight = np.dot(weights, responsibility)
+            second_weight = total - first_weight
+            if first_weight <= 0 or second_weight <= 0:
+                break
+            first_sum = np.dot(sums, responsibility)
+            q = first_weight / total
+            t1 = first_sum / first_weight
+            t2 = (sums.sum() - first_sum) / second_weight
+            if t2 <= 0:
+                break
             
-            sequence.append(x)
+            previous, log_likelihood = log_likelihood, np.dot(weights, np.logaddexp(log_first, log_second))
+            if abs(log_likelihood - previous) <= tol * abs(log_likelihood):
+                break
+        
+        if t1 < t2:
+            t1, t2, q = t2, t1, 1 - q
+        return float(t1), float(t2), float(q)
+    
+    @staticmethod
+    def _hyperexponential_block(rng: np.random.Generator, size: Union[int, Tuple[int, ...]], t1: float, t2: float,
+                                q: float) -> np.ndarray:
+        """Векторизованная генерация блока значений гиперэкспоненциального закона (size - длина или форма)"""
+        # Выбор фазы: с вероятностью q - среднее t1, иначе t2
+        scale = np.where(rng.random(size) < q, t1, t2)
+        # -ln(1 - r) эквивалентно стандартному экспоненциальному распределению
+        sequence = rng.standard_exponential(size)
+        sequence *= scale
+        return sequence
+    
+    @staticmethod
+    def generate_hyperexponential_sequence(size: int, t1: float, t2: float, q: float = 0.3,
+                                           seed: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None) -> np.ndarray:
+        """Генерация последовательности по гиперэкспоненциальному закону
+        
+        seed - зерно (или готовый np.random.Generator) для воспроизводимости генерации
+        """
+        rng = np.random.default_rng(seed)
+        return DistributionApproximator._hyperexponential_block(rng, size, t1, t2, q)
+    
+    @staticmethod
+    def generate_hyperexponential_replications(replications: int, size: int, t1: float, t2: float, q: float = 0.3,
+                                               seed: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None) -> np.ndarray:
+        """Генерация replications независимых последовательностей длины size одним массивом (replications x size)"""
+        rng = np.random.default_rng(seed)
+        return DistributionApproximator._hyperexponential_block(rng, (replications, size), t1, t2, q)
+    
+    @staticmethod
+    def generate_hyperexponential_chunks(size: int, t1: float, t2: float, q: float = 0.3, chunk_size: int = 1_000_000,
+                                         seed: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None) -> Iterator[np.ndarray]:
+        """Поблочная генерация последовательности по гиперэкспоненциальному закону
+        
+        Возвращает блоки по chunk_size значений (последний блок может быть короче),
+        поэтому память ограничена размером блока независимо от size. При одинаковых
+        seed и chunk_size последовательность блоков воспроизводится в точности.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size должен быть положительным")
         
-        return np.array(sequence)
\ No newline at end of file
+        rng = np.random.default_rng(seed)
+        remaining = size
+        while remaining > 0:
+            block_size = min(chunk_size, remaining)
+            yield DistributionApproximator._hyperexponential_block(rng, block_size, t1, t2, q)
+            remaining -= block_size
\ No newline at end of file
@@ -0,0 +1,118 @@
+import numpy as np
+from typing import Dict, Tuple, Union
+from histogram import StreamingHistogram
+
+class GoodnessOfFit:
+    """Критерии согласия исходной последовательности с сгенерированными
+    
+    Все методы принимают одну последовательность (вектор) или матрицу реплик
+    (реплики x значения) и считают статистики и p-значения для всех реплик
+    одним векторизованным вызовом. Для хи-квадрат используются частоты по
+    интервалам гистограммы исходной последовательности.
+    """
+    
+    @staticmethod
+    def bin_counts(samples: np.ndarray, bin_edges: np.ndarray) -> np.ndarray:
+        """Частоты значений по интервалам bin_edges для каждой строки samples
+        
+        Значения левее первого (правее последнего) интервала относятся к крайнему
+        интервалу, поэтому сумма частот строки равна ее длине.
+        """
+        samples = np.asarray(samples, dtype=float)
+        rows = np.atleast_2d(samples)
+        bins = len(bin_edges) - 1
+        
+        values = np.clip(rows, bin_edges[0], bin_edges[-1])
+        indices = StreamingHistogram.bin_indices(values.ravel(), bin_edges).reshape(rows.shape)
+        indices += np.arange(len(rows))[:, None] * bins
+        counts = np.bincount(indices.ravel(), minlength=len(rows) * bins).reshape(len(rows), bins)
+        return counts[0] if samples.ndim == 1 else counts
+    
+    @staticmethod
+    def chi_square(reference_counts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Двухвыборочный критерий хи-квадрат (однородность) по частотам интервалов
+        
+        reference_counts - частоты исходной последовательности, counts - частоты
+        реплик по тем же интервалам (вектор или матрица). Интервалы, пустые в
+        обеих выборках, не учитываются. Возвращает (статистика, степени свободы, p).
+        """
+        from scipy.stats import chi2
+        
+        reference_counts = np.asarray(reference_counts, dtype=float)
+        counts = np.asarray(counts, dtype=float)
+        rows = np.atleast_2d(counts)
+        
+        reference_total = reference_counts.sum()
+        totals = rows.sum(axis=1, keepdims=True)
+        pooled = reference_counts + rows
+        occupied = pooled > 0
+        
+        deviations = np.sqrt(totals / reference_total) * reference_counts - np.sqrt(reference_total / totals) * rows
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = np.where(occupied, deviations**2 / pooled, 0)
+        statistic = terms.sum(axis=1)
+        df = np.maximum(occupied.sum(axis=1) - 1, 1)
+        p_value = chi2.sf(statistic, df)
+        
+        if counts.ndim == 1:
+            return statistic[0], df[0], p_value[0]
+        return statistic, df, p_value
+    
+    @staticmethod
+    def _ecdf_counts(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Для отсортированных строк: число значений < x и <= x в каждой позиции (с учетом повторов)"""
+        length = rows.shape[1]
+        positions = np.broadcast_to(np.arange(length), rows.shape)
+        run_start = np.ones(rows.shape, dtype=bool)
+        run_start[:, 1:] = rows[:, 1:] != rows[:, :-1]
+        run_end = np.ones(rows.shape, dtype=bool)
+        run_end[:, :-1] = run_start[:, 1:]
+        
+        below = np.maximum.accumulate(np.where(run_start, positions, 0), axis=1)
+        at_most = np.minimum.accumulate(np.where(run_end, positions, length)[:, ::-1], axis=1)[:, ::-1] + 1
+        return below, at_most
+    
+    @staticmethod
+    def kolmogorov_smirnov(reference: np.ndarray, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Двухвыборочный критерий Колмогорова-Смирнова (статистика D и асимптотическое p)
+        
+        D = sup|F_ref - F_sample| вычисляется в точках реплик: эмпирическая функция
+        исходной последовательности берется бинарным поиском по ее сортировке,
+        функция реплики - по позициям в отсортированной строке.
+        """
+        from scipy.stats import kstwo
+        
+        samples = np.asarray(samples, dtype=float)
+        rows = np.sort(np.atleast_2d(samples), axis=1)
+        reference = np.sort(np.asarray(reference, dtype=float).ravel())
+        n, m = len(reference), rows.shape[1]
+        
+        below, at_most = GoodnessOfFit._ecdf_counts(rows)
+        reference_below = np.searchsorted(reference, rows, side='left') / n
+        reference_at_most = np.searchsorted(reference, rows, side='right') / n
+        statistic = np.maximum(np.abs(at_most / m - reference_at_most),
+                               np.abs(below / m - reference_below)).max(axis=1)
+        p_value = kstwo.sf(statistic, np.round(n * m / (n + m)))
+        
+        if samples.ndim == 1:
+            return statistic[0], p_value[0]
+        return statistic, p_value
+    
+    @staticmethod
+    def compare(reference: np.ndarray, samples: np.ndarray, reference_counts: np.ndarray,
+                bin_edges: np.ndarray) -> Dict[str, Union[float, np.ndarray]]:
+        """Хи-квадрат и Колмогоров-Смирнов для реплик относительно исходной последовательности
+        
+        reference_counts и bin_edges - готовая гистограмма исходной
+        последовательности (например, из calculate_histogram_intervals).
+        """
+        chi2_statistic, chi2_df, chi2_p = GoodnessOfFit.chi_square(
+            reference_counts, GoodnessOfFit.bin_counts(samples, bin_edges))
+        ks_statistic, ks_p = GoodnessOfFit.kolmogorov_smirnov(reference, samples)
+        return {
+            'chi2': chi2_statistic,
+            'chi2_df': chi2_df,
+            'chi2_p': chi2_p,
+            'ks': ks_statistic,
+            'ks_p': ks_p,
+        }
\ No newline at end of file
@@ -0,0 +1,147 @@
+import copy
+import numpy as np
+from typing import Tuple, Optional
+
+class StreamingHistogram:
+    """Гистограмма с равными интервалами, накапливаемая по блокам
+    
+    С заданным range границы фиксированы: частоты совпадают с np.histogram по тем
+    же границам, значения вне диапазона считаются в underflow/overflow. Без range
+    границы адаптивные: диапазон задается первым блоком, а при выходе значений за
+    него ширина интервалов удваивается (соседние интервалы сливаются), поэтому
+    число интервалов и память постоянны при любом объеме данных.
+    """
+    
+    def __init__(self, bins: int = 18, range: Optional[Tuple[float, float]] = None):
+        if bins < 1:
+            raise ValueError("Число интервалов должно быть положительным")
+        self.bins = bins
+        self.adaptive = range is None
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.low = self.high = self.width = None
+        if range is not None:
+            self._set_range(*range)
+    
+    def _set_range(self, low: float, high: float):
+        if low == high:  # как в np.histogram для вырожденного диапазона
+            low, high = low - 0.5, high + 0.5
+        # Правая граница хранится точно: low + bins * width может округлиться
+        # ниже максимума, и максимум попал бы в overflow
+        self.low = float(low)
+        self.high = float(high)
+        self.width = (self.high - self.low) / self.bins
+    
+    @property
+    def bin_edges(self) -> np.ndarray:
+        """Границы интервалов"""
+        if self.low is None:
+            return np.empty(0)
+        return np.linspace(self.low, self.high, self.bins + 1)
+    
+    @staticmethod
+    def bin_indices(values: np.ndarray, bin_edges: np.ndarray) -> np.ndarray:
+        """Номера интервалов с равной шириной для значений внутри [bin_edges[0], bin_edges[-1]]
+        
+        Номер вычисляется арифметически и уточняется сравнением с границами,
+        как в np.histogram; последний интервал включает правую границу.
+        """
+        bins = len(bin_edges) - 1
+        low, high = bin_edges[0], bin_edges[-1]
+        indices = ((values - low) * (bins / (high - low))).astype(np.int64)
+        np.clip(indices, 0, bins - 1, out=indices)
+        indices[values < bin_edges[indices]] -= 1
+        indices[(values >= bin_edges[indices + 1]) & (indices != bins - 1)] += 1
+        return indices
+    
+    def _double_width(self, extend_left: bool):
+        """Удвоение ширины интервалов со слиянием частот соседних интервалов"""
+        if extend_left:
+            # Сдвиг на четное число старых интервалов сохраняет совпадение границ
+            shift = self.bins if self.bins % 2 == 0 else max(self.bins - 1, 1)
+            new_low = self.low - shift * self.width
+            new_high = self.high if shift == self.bins else new_low + 2 * self.bins * self.width
+        else:
+            new_low = self.low
+            new_high = self.low + 2 * self.bins * self.width
+        centers = self.low + (np.arange(self.bins) + 0.5) * self.width
+        targets = np.clip(((centers - new_low) // (2 * self.width)).astype(np.int64), 0, self.bins - 1)
+        self.counts = np.bincount(targets, weights=self.counts, minlength=self.bins).astype(np.int64)
+        self.low = new_low
+        self.high = new_high
+        self.width *= 2
+    
+    def _cover(self, low: float, high: float):
+        """Расширение адаптивного диапазона до [low, high]"""
+        if self.low is None:
+            self._set_range(low, high)
+            return
+        while low < self.low or high > self.high:
+            self._double_width(extend_left=low < self.low)
+    
+    def update(self, chunk: np.ndarray) -> 'StreamingHistogram':
+        """Добавление блока значений"""
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if len(chunk) == 0:
+            return self
+        chunk_min, chunk_max = float(chunk.min()), float(chunk.max())
+        self.count += len(chunk)
+        self.min = min(self.min, chunk_min)
+        self.max = max(self.max, chunk_max)
+        
+        if self.adaptive:
+            self._cover(chunk_min, chunk_max)
+            inside = chunk
+        else:
+            below = chunk < self.low
+            above = chunk > self.high
+            self.underflow += int(np.count_nonzero(below))
+            self.overflow += int(np.count_nonzero(above))
+            outside = below | above
+            inside = chunk[~outside] if outside.any() else chunk
+        
+        self.counts += np.bincount(self.bin_indices(inside, self.bin_edges), minlength=self.bins)
+        return self
+    
+    def merge(self, other: 'StreamingHistogram') -> 'StreamingHistogram':
+        """Объединение с частичной гистограммой (например, другого обработчика)
+        
+        Фиксированные гистограммы должны иметь одинаковые границы. Адаптивные
+        сводятся к общей сетке: частоты other переносятся по центрам интервалов,
+        что точно при совпадающих сетках и приближенно в остальных случаях.
+        """
+        if other.bins != self.bins or other.adaptive != self.adaptive:
+            raise ValueError("Гистограммы с разным числом интервалов или режимом нельзя объединить")
+        if other.count == 0:
+            return self
+        if self.count == 0 and self.adaptive:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        
+        if not self.adaptive:
+            if not np.allclose(self.bin_edges, other.bin_edges):
+                raise ValueError("Гистограммы с разными границами интервалов нельзя объединить")
+            self.counts += other.counts
+            self.underflow += other.underflow
+            self.overflow += other.overflow
+        else:
+            self._cover(other.low, other.high)
+            while self.width < other.width:
+                self._double_width(extend_left=False)
+            centers = other.low + (np.arange(other.bins) + 0.5) * other.width
+            targets = np.clip(((centers - self.low) // self.width).astype(np.int64), 0, self.bins - 1)
+            self.counts += np.bincount(targets, weights=other.counts, minlength=self.bins).astype(np.int64)
+        
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+    
+    def intervals(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Таблица интервалов массивами: левые границы, правые границы, частоты"""
+        edges = self.bin_edges
+        return edges[:-1], edges[1:], self.counts.copy()
\ No newline at end of file
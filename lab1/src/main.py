@@ -1,74 +1,58 @@
+import argparse
 import numpy as np
-import pandas as pd
-from utils import read_data, calculate_relative_deviation, get_sample_sizes
+from typing import List, Optional
+from utils import read_data, get_sample_sizes
+from analysis import analyze_sequence, CONFIDENCE_LEVELS
+from replication import ReplicationEngine
 from statistics import StatisticsCalculator
-from distribution import DistributionApproximator
-from visualization import Visualizer
+from distribution import DistributionApproximator, FIT_METHODS
+from goodness_of_fit import GoodnessOfFit
+from rolling import RollingStatistics
+from profiling import Profiler
+from results import CharacteristicsTable
+from cache import ResultCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from visualization import Visualizer, PLOT_MODES
+
+# Ключи критериев согласия в оценках по репликам (печатаются отдельно)
+GOODNESS_OF_FIT_KEYS = ('chi2', 'chi2_df', 'chi2_p', 'ks', 'ks_p')
 
 def format_confidence_interval(value: float) -> str:
     """Форматирование доверительного интервала в виде ±значение"""
     return f"±{value:.4f}"
 
-def print_form1_table(results: dict, relative_results: dict, sample_sizes: list):
-    """Печать полной таблицы ФОРМА 1"""
-    print("\n" + "="*100)
+def form1_rows(confidences=CONFIDENCE_LEVELS) -> list:
+    """Строки ФОРМЫ 1: (подпись, характеристика, форматирование значения)"""
+    value = lambda x: f"{x:.4f}"
+    rows = [("Мат. ож.", 'mean', value)]
+    for confidence in confidences:
+        label = f"Дов. инт. ({str(confidence).replace('.', ',')})"
+        rows.append((label, StatisticsCalculator.confidence_key(confidence), format_confidence_interval))
+    rows += [("Дисперсия", 'variance', value), ("С. к. о.", 'std', value), ("К-т вариации", 'variation', value)]
+    return rows
+
+def print_form1_table(form1: CharacteristicsTable, relative: CharacteristicsTable):
+    """Печать полной таблицы ФОРМА 1 для любого набора размеров выборки"""
+    width = max(100, 20 + 13 * len(form1))
+    print("\n" + "="*width)
     print("ФОРМА 1: Характеристики заданной ЧП")
-    print("="*100)
-    
-    # Заголовки таблицы
-    headers = ["Характеристика", "10", "20", "50", "100", "200", "300"]
-    print(f"{headers[0]:<20} {headers[1]:<12} {headers[2]:<12} {headers[3]:<12} {headers[4]:<12} {headers[5]:<12} {headers[6]:<12}")
-    print("-"*100)
-    
-    # 1. Математическое ожидание
-    means = [f"{results[n]['mean']:.4f}" for n in sample_sizes]
-    rel_means = [f"{relative_results[n]['mean']:.2f}%" for n in sample_sizes]
-    print(f"{'Мат. ож.':<20} {means[0]:<12} {means[1]:<12} {means[2]:<12} {means[3]:<12} {means[4]:<12} {means[5]:<12}")
-    print(f"{'':<20} {rel_means[0]:<12} {rel_means[1]:<12} {rel_means[2]:<12} {rel_means[3]:<12} {rel_means[4]:<12} {rel_means[5]:<12}")
-    print()
-    
-    # 2. Доверительный интервал (0.9)
-    ci_90_values = [format_confidence_interval(results[n]['ci_90']) for n in sample_sizes]
-    rel_ci_90 = [f"{relative_results[n].get('ci_90', 0):.2f}%" for n in sample_sizes]
-    print(f"{'Дов. инт. (0,9)':<20} {ci_90_values[0]:<12} {ci_90_values[1]:<12} {ci_90_values[2]:<12} {ci_90_values[3]:<12} {ci_90_values[4]:<12} {ci_90_values[5]:<12}")
-    print(f"{'':<20} {rel_ci_90[0]:<12} {rel_ci_90[1]:<12} {rel_ci_90[2]:<12} {rel_ci_90[3]:<12} {rel_ci_90[4]:<12} {rel_ci_90[5]:<12}")
-    print()
-    
-    # 3. Доверительный интервал (0.95)
-    ci_95_values = [format_confidence_interval(results[n]['ci_95']) for n in sample_sizes]
-    rel_ci_95 = [f"{relative_results[n].get('ci_95', 0):.2f}%" for n in sample_sizes]
-    print(f"{'Дов. инт. (0,95)':<20} {ci_95_values[0]:<12} {ci_95_values[1]:<12} {ci_95_values[2]:<12} {ci_95_values[3]:<12} {ci_95_values[4]:<12} {ci_95_values[5]:<12}")
-    print(f"{'':<20} {rel_ci_95[0]:<12} {rel_ci_95[1]:<12} {rel_ci_95[2]:<12} {rel_ci_95[3]:<12} {rel_ci_95[4]:<12} {rel_ci_95[5]:<12}")
-    print()
-    
-    # 4. Доверительный интервал (0.99)
-    ci_99_values = [format_confidence_interval(results[n]['ci_99']) for n in sample_sizes]
-    rel_ci_99 = [f"{relative_results[n].get('ci_99', 0):.2f}%" for n in sample_sizes]
-    print(f"{'Дов. инт. (0,99)':<20} {ci_99_values[0]:<12} {ci_99_values[1]:<12} {ci_99_values[2]:<12} {ci_99_values[3]:<12} {ci_99_values[4]:<12} {ci_99_values[5]:<12}")
-    print(f"{'':<20} {rel_ci_99[0]:<12} {rel_ci_99[1]:<12} {rel_ci_99[2]:<12} {rel_ci_99[3]:<12} {rel_ci_99[4]:<12} {rel_ci_99[5]:<12}")
-    print()
-    
-    # 5. Дисперсия
-    variances = [f"{results[n]['variance']:.4f}" for n in sample_sizes]
-    rel_variances = [f"{relative_results[n]['variance']:.2f}%" for n in sample_sizes]
-    print(f"{'Дисперсия':<20} {variances[0]:<12} {variances[1]:<12} {variances[2]:<12} {variances[3]:<12} {variances[4]:<12} {variances[5]:<12}")
-    print(f"{'':<20} {rel_variances[0]:<12} {rel_variances[1]:<12} {rel_variances[2]:<12} {rel_variances[3]:<12} {rel_variances[4]:<12} {rel_variances[5]:<12}")
-    print()
-    
-    # 6. Среднеквадратическое отклонение (СКО)
-    stds = [f"{results[n]['std']:.4f}" for n in sample_sizes]
-    rel_stds = [f"{relative_results[n]['std']:.2f}%" for n in sample_sizes]
-    print(f"{'С. к. о.':<20} {stds[0]:<12} {stds[1]:<12} {stds[2]:<12} {stds[3]:<12} {stds[4]:<12} {stds[5]:<12}")
-    print(f"{'':<20} {rel_stds[0]:<12} {rel_stds[1]:<12} {rel_stds[2]:<12} {rel_stds[3]:<12} {rel_stds[4]:<12} {rel_stds[5]:<12}")
-    print()
-    
-    # 7. Коэффициент вариации
-    variations = [f"{results[n]['variation']:.4f}" for n in sample_sizes]
-    rel_variations = [f"{relative_results[n]['variation']:.2f}%" for n in sample_sizes]
-    print(f"{'К-т вариации':<20} {variations[0]:<12} {variations[1]:<12} {variations[2]:<12} {variations[3]:<12} {variations[4]:<12} {variations[5]:<12}")
-    print(f"{'':<20} {rel_variations[0]:<12} {rel_variations[1]:<12} {rel_variations[2]:<12} {rel_variations[3]:<12} {rel_variations[4]:<12} {rel_variations[5]:<12}")
-    
-    print("\nПримечание: % - относительные отклонения от значений для выборки из 300 величин")
+    print("="*width)
+    
+    def print_row(label: str, cells: list):
+        print(f"{label:<20} " + " ".join(f"{cell:<12}" for cell in cells))
+    
+    # Заголовки таблицы: размеры выборки
+    print_row("Характеристика", [str(n) for n in form1.sample_sizes])
+    print("-"*width)
+    
+    # Для каждой характеристики: значения и относительные отклонения
+    rows = [row for row in form1_rows() if row[1] in form1]
+    for i, (label, key, formatter) in enumerate(rows):
+        print_row(label, [formatter(x) for x in form1[key]])
+        print_row('', [f"{x:.2f}%" for x in relative[key]])
+        if i < len(rows) - 1:
+            print()
+    
+    print(f"\nПримечание: % - относительные отклонения от значений для выборки из {form1.sample_sizes.max()} величин")
 
 def print_autocorrelation_comparison(original_autocorr: list, generated_autocorr: list):
     """Печать сравнения коэффициентов автокорреляции"""
@@ -82,121 +66,126 @@ def print_autocorrelation_comparison(original_autocorr: list, generated_autocorr
         difference = abs(orig - gen)
         print(f"{i:<6} {orig:<12.4f} {gen:<16.4f} {difference:<12.4f}")
 
-def main():
-    # 1. Чтение данных
-    print("=== УИР 1: Статистический анализ числовой последовательности ===")
-    data = read_data('data/numbers.txt')
-    
-    if len(data) == 0:
-        print("Ошибка: не удалось загрузить данные")
-        return
+def print_replication_summary(summary: dict, reference: dict, replications: int):
+    """Печать выборочных распределений оценок по репликам Монте-Карло"""
+    print("\n" + "="*80)
+    print(f"ТОЧНОСТЬ ОЦЕНОК ПО {replications} РЕПЛИКАМ СГЕНЕРИРОВАННОЙ ПОСЛЕДОВАТЕЛЬНОСТИ")
+    print("="*80)
+    print(f"{'Характеристика':<16} {'Исходная':<12} {'Среднее':<12} {'СКО':<12} {'5%':<12} {'50%':<12} {'95%':<12}")
+    print("-"*80)
     
-    print(f"Загружено {len(data)} значений")
-    print(f"Первые 10 значений: {data[:10]}")
+    for key, values in summary.items():
+        if key == 'autocorrelation' or key in GOODNESS_OF_FIT_KEYS:
+            continue
+        low, median, high = values['quantiles']
+        print(f"{key:<16} {reference.get(key, np.nan):<12.4f} {values['mean']:<12.4f} {values['std']:<12.4f} "
+              f"{low:<12.4f} {median:<12.4f} {high:<12.4f}")
     
-    # 2. Анализ для разных размеров выборки
-    sample_sizes = get_sample_sizes()
-    reference_sample = data[:300]  # Эталонная выборка (300 элементов)
+    acf = summary['autocorrelation']
+    for lag in range(len(acf['mean'])):
+        low, median, high = acf['quantiles'][:, lag]
+        print(f"{f'acf_{lag + 1}':<16} {'':<12} {acf['mean'][lag]:<12.4f} {acf['std'][lag]:<12.4f} "
+              f"{low:<12.4f} {median:<12.4f} {high:<12.4f}")
+
+def print_replication_tests(estimates: dict, significance: float = 0.05):
+    """Печать доли реплик, для которых критерии согласия отвергают совпадение с исходной"""
+    print(f"\nДоля реплик, отличающихся от исходной последовательности (уровень значимости {significance}):")
+    print(f"Хи-квадрат: {np.mean(estimates['chi2_p'] < significance):.4f}")
+    print(f"Колмогоров-Смирнов: {np.mean(estimates['ks_p'] < significance):.4f}")
+
+def print_rolling_summary(rolling: dict, drift: dict, window: int):
+    """Печать сводки характеристик в скользящем окне и отмеченных смен режима"""
+    print("\n" + "="*80)
+    print(f"ХАРАКТЕРИСТИКИ В СКОЛЬЗЯЩЕМ ОКНЕ (длина {window}, окон {len(rolling['end'])})")
+    print("="*80)
+    print(f"{'Характеристика':<25} {'Минимум':<12} {'Медиана':<12} {'Максимум':<12}")
+    print("-"*65)
+    for label, values in (("Мат. ож.", rolling['mean']), ("Дисперсия", rolling['variance']),
+                          ("К-т вариации", rolling['variation']), ("Автокорреляция (1)", rolling['autocorrelation'][:, 0])):
+        print(f"{label:<25} {np.min(values):<12.4f} {np.median(values):<12.4f} {np.max(values):<12.4f}")
     
-    # Характеристики эталонной выборки
-    ref_mean = StatisticsCalculator.calculate_mean(reference_sample)
-    ref_variance = StatisticsCalculator.calculate_variance(reference_sample)
-    ref_std = StatisticsCalculator.calculate_std(reference_sample)
-    ref_variation = StatisticsCalculator.calculate_variation_coefficient(reference_sample)
+    flagged = np.flatnonzero(drift['drift'])
+    print(f"\nОкон со сменой режима (|z| > 3): {len(flagged)}")
+    if len(flagged):
+        ends = rolling['end'][flagged]
+        print(f"Первое такое окно: значения {ends[0] - window}..{ends[0] - 1}, последнее: {ends[-1] - window}..{ends[-1] - 1}")
+
+def print_goodness_of_fit(tests: dict, significance: float = 0.05):
+    """Печать критериев согласия исходной и сгенерированной последовательностей"""
+    print(f"\nКритерии согласия (уровень значимости {significance}):")
+    print(f"{'Критерий':<25} {'Статистика':<12} {'p-значение':<12} {'Вывод':<20}")
+    print("-"*65)
+    for name, statistic, p_value in ((f"Хи-квадрат (df={tests['chi2_df']})", tests['chi2'], tests['chi2_p']),
+                                     ("Колмогоров-Смирнов", tests['ks'], tests['ks_p'])):
+        verdict = "согласуются" if p_value >= significance else "различаются"
+        print(f"{name:<25} {statistic:<12.4f} {p_value:<12.4f} {verdict:<20}")
+
+def print_analysis(data: np.ndarray, result: dict):
+    """Вывод результатов анализа последовательности и построение графиков"""
+    reference_size = result['reference_size']
+    reference_sample = data[:reference_size]  # Эталонная выборка (наибольший размер выборки)
+    reference = result['reference']
     
-    # Доверительные интервалы для эталонной выборки
-    ref_ci_90 = StatisticsCalculator.calculate_confidence_interval(reference_sample, 0.9)
-    ref_ci_95 = StatisticsCalculator.calculate_confidence_interval(reference_sample, 0.95)
-    ref_ci_99 = StatisticsCalculator.calculate_confidence_interval(reference_sample, 0.99)
+    ref_mean = reference['mean']
+    ref_variance = reference['variance']
+    ref_std = reference['std']
+    ref_variation = reference['variation']
     
-    print(f"\nЭталонные характеристики (n=300):")
+    if result['skipped_sizes']:
+        print(f"\nРазмеры выборки больше длины последовательности ({len(data)}) пропущены: "
+              f"{', '.join(str(n) for n in result['skipped_sizes'])}")
+    print(f"\nЭталонные характеристики (n={reference_size}):")
     print(f"Математическое ожидание: {ref_mean:.4f}")
     print(f"Дисперсия: {ref_variance:.4f}")
     print(f"СКО: {ref_std:.4f}")
     print(f"Коэффициент вариации: {ref_variation:.4f}")
-    print(f"Дов. интервал (0.9): ±{ref_ci_90:.4f}")
-    print(f"Дов. интервал (0.95): ±{ref_ci_95:.4f}")
-    print(f"Дов. интервал (0.99): ±{ref_ci_99:.4f}")
+    print(f"Дов. интервал (0.9): ±{reference['ci_90']:.4f}")
+    print(f"Дов. интервал (0.95): ±{reference['ci_95']:.4f}")
+    print(f"Дов. интервал (0.99): ±{reference['ci_99']:.4f}")
     
-    # 3. Расчет характеристик для разных размеров выборки
-    results = {}
+    # Вывод полной таблицы ФОРМА 1
+    print_form1_table(result['form1'], result['relative'])
     
-    for n in sample_sizes:
-        sample = data[:n]
-        
-        mean = StatisticsCalculator.calculate_mean(sample)
-        variance = StatisticsCalculator.calculate_variance(sample)
-        std = StatisticsCalculator.calculate_std(sample)
-        variation = StatisticsCalculator.calculate_variation_coefficient(sample)
-        
-        # Доверительные интервалы
-        ci_90 = StatisticsCalculator.calculate_confidence_interval(sample, 0.9)
-        ci_95 = StatisticsCalculator.calculate_confidence_interval(sample, 0.95)
-        ci_99 = StatisticsCalculator.calculate_confidence_interval(sample, 0.99)
-        
-        results[n] = {
-            'mean': mean, 'variance': variance, 'std': std, 'variation': variation,
-            'ci_90': ci_90, 'ci_95': ci_95, 'ci_99': ci_99
-        }
-    
-    # 4. Относительные отклонения (включая доверительные интервалы)
-    relative_results = {}
-    for n in sample_sizes:
-        if n == 300:  # Для эталона отклонение 0%
-            relative_results[n] = {
-                'mean': 0, 'variance': 0, 'std': 0, 'variation': 0,
-                'ci_90': 0, 'ci_95': 0, 'ci_99': 0
-            }
-        else:
-            rel_mean = abs((results[n]['mean'] - ref_mean) / ref_mean) * 100
-            rel_variance = abs((results[n]['variance'] - ref_variance) / ref_variance) * 100
-            rel_std = abs((results[n]['std'] - ref_std) / ref_std) * 100
-            rel_variation = abs((results[n]['variation'] - ref_variation) / ref_variation) * 100
-            rel_ci_90 = abs((results[n]['ci_90'] - ref_ci_90) / ref_ci_90) * 100 if ref_ci_90 != 0 else 0
-            rel_ci_95 = abs((results[n]['ci_95'] - ref_ci_95) / ref_ci_95) * 100 if ref_ci_95 != 0 else 0
-            rel_ci_99 = abs((results[n]['ci_99'] - ref_ci_99) / ref_ci_99) * 100 if ref_ci_99 != 0 else 0
-            
-            relative_results[n] = {
-                'mean': rel_mean, 'variance': rel_variance, 'std': rel_std, 'variation': rel_variation,
-                'ci_90': rel_ci_90, 'ci_95': rel_ci_95, 'ci_99': rel_ci_99
-            }
-    
-    # 5. Вывод полной таблицы ФОРМА 1
-    print_form1_table(results, relative_results, sample_sizes)
-    
-    # 6. Визуализация исходной последовательности
+    # Визуализация исходной последовательности
     print("\n" + "="*50)
     print("ВИЗУАЛИЗАЦИЯ ИСХОДНОЙ ПОСЛЕДОВАТЕЛЬНОСТИ")
     print("="*50)
     
     # График последовательности
-    Visualizer.plot_sequence(data[:300], "Исходная числовая последовательность")
+    Visualizer.plot_sequence(reference_sample, "Исходная числовая последовательность")
     
     # Автокорреляционный анализ исходной последовательности
-    original_autocorrelations = StatisticsCalculator.calculate_autocorrelation(reference_sample)
-    print(f"Коэффициенты автокорреляции исходной последовательности:")
+    original_autocorrelations = result['autocorrelation']
+    original_bound = result['autocorrelation_bound']
+    print(f"Коэффициенты автокорреляции исходной последовательности (граница значимости ±{original_bound:.4f}):")
     for i, acf in enumerate(original_autocorrelations, 1):
         print(f"Сдвиг {i}: {acf:.4f}")
-    Visualizer.plot_autocorrelation(original_autocorrelations, "Автокорреляционный анализ исходной последовательности")
+    Visualizer.plot_autocorrelation(original_autocorrelations, "Автокорреляционный анализ исходной последовательности",
+                                    original_bound)
     
     # Гистограмма с таблицей интервалов
     print("\nГИСТОГРАММА РАСПРЕДЕЛЕНИЯ ЧАСТОТ (исходная последовательность)")
-    frequencies, bin_edges, intervals_table = Visualizer.plot_histogram(reference_sample)
+    frequencies, bin_edges, intervals_table = Visualizer.plot_histogram(reference_sample, histogram=result['histogram'])
     Visualizer.print_histogram_table(intervals_table)
     
-    # 7. Аппроксимация закона распределения
+    # Аппроксимация закона распределения
     print(f"\nАппроксимация закона распределения:")
-    dist_type = DistributionApproximator.determine_distribution_type(ref_variation)
+    dist_type = result['distribution_type']
     print(f"Коэффициент вариации: {ref_variation:.4f} -> Тип распределения: {dist_type}")
     
-    if dist_type == "гиперэкспоненциальный":
-        t1, t2 = DistributionApproximator.hyperexponential_parameters(ref_mean, ref_variation)
-        print(f"Параметры гиперэкспоненциального распределения: t1={t1:.4f}, t2={t2:.4f}")
-        
-        # Генерация новой последовательности
-        generated_sequence = DistributionApproximator.generate_hyperexponential_sequence(300, t1, t2)
+    if 'phase_means' in result:
+        k, phase_mean = result['erlang']
+        print(f"Параметры закона Эрланга: k={k}, среднее фазы={phase_mean:.4f}")
+        print(f"Средние фаз гипоэкспоненциального распределения: "
+              f"{', '.join(f'{value:.4f}' for value in result['phase_means'])}")
+    
+    if 'generated' in result:
+        print(f"Параметры гиперэкспоненциального распределения: t1={result['t1']:.4f}, t2={result['t2']:.4f}")
+        if result['fit'] == 'em':
+            print(f"Оценка методом EM по данным: q={result['q']:.4f}")
+        generated_sequence = result['generated']
         
-        # 8. Анализ сгенерированной последовательности
+        # Анализ сгенерированной последовательности
         print("\n" + "="*50)
         print("АНАЛИЗ СГЕНЕРИРОВАННОЙ ПОСЛЕДОВАТЕЛЬНОСТИ")
         print("="*50)
@@ -205,33 +194,41 @@ def main():
         Visualizer.plot_sequence(generated_sequence, "Сгенерированная числовая последовательность")
         
         # Автокорреляционный анализ сгенерированной последовательности
-        generated_autocorrelations = StatisticsCalculator.calculate_autocorrelation(generated_sequence)
-        print(f"Коэффициенты автокорреляции сгенерированной последовательности:")
+        generated_autocorrelations = result['generated_autocorrelation']
+        generated_bound = result['generated_autocorrelation_bound']
+        print(f"Коэффициенты автокорреляции сгенерированной последовательности (граница значимости ±{generated_bound:.4f}):")
         for i, acf in enumerate(generated_autocorrelations, 1):
             print(f"Сдвиг {i}: {acf:.4f}")
-        Visualizer.plot_autocorrelation(generated_autocorrelations, "Автокорреляционный анализ сгенерированной последовательности")
+        Visualizer.plot_autocorrelation(generated_autocorrelations, "Автокорреляционный анализ сгенерированной последовательности",
+                                        generated_bound)
         
         # Сравнение коэффициентов автокорреляции
         print_autocorrelation_comparison(original_autocorrelations, generated_autocorrelations)
         
         # Гистограмма сгенерированной последовательности
         print("\nГИСТОГРАММА РАСПРЕДЕЛЕНИЯ ЧАСТОТ (сгенерированная последовательность)")
-        gen_frequencies, gen_bin_edges, gen_intervals_table = Visualizer.plot_histogram(generated_sequence)
+        gen_frequencies, gen_bin_edges, gen_intervals_table = Visualizer.plot_histogram(
+            generated_sequence, histogram=result['generated_histogram'])
         Visualizer.print_histogram_table(gen_intervals_table)
         
         # Сравнение гистограмм
         print("\nСРАВНЕНИЕ ГИСТОГРАММ:")
-        Visualizer.plot_comparison_histograms(reference_sample, generated_sequence)
+        Visualizer.plot_comparison_histograms(reference_sample, generated_sequence,
+                                              original_histogram=result['histogram'],
+                                              generated_histogram=result['generated_histogram'])
         
         # Корреляционный анализ между последовательностями
-        correlation = StatisticsCalculator.calculate_correlation(reference_sample, generated_sequence)
-        print(f"Коэффициент корреляции между последовательностями: {correlation:.4f}")
+        print(f"Коэффициент корреляции между последовательностями: {result['correlation']:.4f}")
+        
+        # Критерии согласия исходной и сгенерированной последовательностей
+        print_goodness_of_fit(result['goodness_of_fit'])
         
         # Анализ характеристик сгенерированной последовательности
-        gen_mean = StatisticsCalculator.calculate_mean(generated_sequence)
-        gen_variance = StatisticsCalculator.calculate_variance(generated_sequence)
-        gen_std = StatisticsCalculator.calculate_std(generated_sequence)
-        gen_variation = StatisticsCalculator.calculate_variation_coefficient(generated_sequence)
+        generated = result['generated_characteristics']
+        gen_mean = generated['mean']
+        gen_variance = generated['variance']
+        gen_std = generated['std']
+        gen_variation = generated['variation']
         
         print(f"\nСравнение характеристик:")
         print(f"{'Характеристика':<25} {'Исходная':<12} {'Сгенерированная':<16} {'Отклонение %':<12}")
@@ -240,6 +237,184 @@ def main():
         print(f"{'Дисперсия':<25} {ref_variance:<12.4f} {gen_variance:<16.4f} {abs((gen_variance - ref_variance)/ref_variance)*100:<12.2f}")
         print(f"{'СКО':<25} {ref_std:<12.4f} {gen_std:<16.4f} {abs((gen_std - ref_std)/ref_std)*100:<12.2f}")
         print(f"{'Коэф. вариации':<25} {ref_variation:<12.4f} {gen_variation:<16.4f} {abs((gen_variation - ref_variation)/ref_variation)*100:<12.2f}")
+
+def enable_profiling():
+    """Включение замеров этапов и методов расчетных классов"""
+    for cls in (StatisticsCalculator, DistributionApproximator, Visualizer, ReplicationEngine, GoodnessOfFit,
+                RollingStatistics):
+        Profiler.instrument(cls)
+    Profiler.enable()
+
+def write_profile(path: str):
+    """Сохранение профиля в JSON и печать сводки по этапам"""
+    Profiler.write_json(path)
+    Profiler.print_summary()
+    print(f"Профиль сохранен: {path}")
+
+def parse_sample_sizes(token: str) -> List[int]:
+    """Размеры выборки из аргумента: число N или диапазон start:stop[:step] (stop включительно)"""
+    try:
+        parts = [int(part) for part in token.split(':')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается число или start:stop[:step], получено '{token}'")
+    if len(parts) > 3 or (len(parts) == 3 and parts[2] <= 0):
+        raise argparse.ArgumentTypeError(f"ожидается число или start:stop[:step] с положительным шагом: '{token}'")
+    sizes = list(range(parts[0], parts[1] + 1, parts[2] if len(parts) == 3 else 1)) if len(parts) > 1 else parts
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError(f"размеры выборки должны быть положительными: '{token}'")
+    return sizes
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Статистический анализ числовой последовательности")
+    parser.add_argument('input', nargs='?', default='data/numbers.txt',
+                        help="файл с последовательностью (по умолчанию data/numbers.txt)")
+    parser.add_argument('--batch', metavar='PATH',
+                        help="пакетный режим: каталог или шаблон файлов (например, 'data/*.txt')")
+    parser.add_argument('--output', default='batch_results.csv',
+                        help="сводная таблица пакетного режима (по умолчанию batch_results.csv)")
+    parser.add_argument('--table', metavar='PATH',
+                        help="сохранить таблицу характеристик ФОРМЫ 1 (.csv, .json или .parquet); "
+                             "в пакетном режиме - объединенную по всем файлам")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="число процессов пакетного режима (по умолчанию по числу ядер)")
+    parser.add_argument('--seed', type=int, default=None, help="зерно генератора случайных чисел")
+    parser.add_argument('--sample-sizes', nargs='+', type=parse_sample_sizes, metavar='N',
+                        help="размеры выборки ФОРМЫ 1: числа и диапазоны start:stop[:step] "
+                             f"(по умолчанию {' '.join(str(n) for n in get_sample_sizes())})")
+    parser.add_argument('--fit', choices=FIT_METHODS, default='moments',
+                        help="оценка параметров закона: moments - по моментам (q=0.3), em - t1, t2, q методом EM")
+    parser.add_argument('--replications', type=int, default=0,
+                        help="число реплик Монте-Карло для оценки точности характеристик (0 - не выполнять)")
+    parser.add_argument('--replication-workers', type=int, default=0,
+                        help="число процессов для расчета реплик")
+    parser.add_argument('--cache', metavar='DIR', nargs='?', const=DEFAULT_CACHE_DIR,
+                        help=f"кэш результатов этапов анализа (по умолчанию каталог {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-size', type=float, default=DEFAULT_MAX_BYTES / 2**20,
+                        help="предельный размер кэша результатов, МиБ")
+    parser.add_argument('--rolling', type=int, metavar='WINDOW', default=0,
+                        help="характеристики в скользящем окне длины WINDOW и поиск смены режима")
+    parser.add_argument('--rolling-step', type=int, default=1, help="шаг скользящего окна")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="замер времени и памяти по этапам с сохранением профиля в JSON "
+                             "(в пакетном режиме - этапы управляющего процесса)")
+    parser.add_argument('--plots', choices=PLOT_MODES, default='show',
+                        help="графики: show - окна, save - файлы без GUI, off - не строить")
+    parser.add_argument('--plots-dir', default='plots', help="каталог для графиков в режиме save")
+    parser.add_argument('--plot-workers', type=int, default=0,
+                        help="число процессов для построения графиков в режиме save")
+    args = parser.parse_args(argv)
+    if args.rolling < 0 or args.rolling == 1:
+        parser.error("длина скользящего окна должна быть не меньше 2 (0 - не рассчитывать)")
+    if args.rolling_step < 1:
+        parser.error("шаг скользящего окна должен быть положительным")
+    if args.sample_sizes is not None:
+        # Объединение чисел и диапазонов без повторов с сохранением порядка
+        args.sample_sizes = list(dict.fromkeys(n for sizes in args.sample_sizes for n in sizes))
+    else:
+        args.sample_sizes = get_sample_sizes()
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    cache = ResultCache(args.cache, int(args.cache_size * 2**20)) if args.cache else None
+    if args.table:
+        try:
+            CharacteristicsTable.check_export_path(args.table)
+        except ValueError as e:
+            print(f"Ошибка: {e}")
+            return
+    
+    if args.batch:
+        from batch import run_batch
+        if args.profile:
+            # Замеряются этапы управляющего процесса; без tracemalloc, чтобы не замедлять
+            # процессы пула, которые наследуют состояние при fork
+            Profiler.enable(track_memory=False)
+        print(f"=== Пакетный анализ: {args.batch} ===")
+        try:
+            with Profiler.stage('batch'):
+                rows = run_batch(args.batch, args.output, workers=args.workers, seed=args.seed, fit=args.fit,
+                                 sample_sizes=args.sample_sizes, table_path=args.table, cache=cache)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка записи результатов: {e}")
+            return
+        failed = [row for row in rows if row['status'] != 'ok']
+        print(f"Обработано файлов: {len(rows)}, с ошибками: {len(failed)}")
+        for row in failed:
+            print(f"  {row['file']}: {row['error']}")
+        print(f"Сводная таблица: {args.output}")
+        if args.table:
+            print(f"Таблица характеристик: {args.table}")
+        if args.profile:
+            write_profile(args.profile)
+        return
+    
+    if args.profile:
+        enable_profiling()
+    
+    # 1. Чтение данных
+    print("=== УИР 1: Статистический анализ числовой последовательности ===")
+    try:
+        with Profiler.stage('load'):
+            data = read_data(args.input)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка чтения файла: {e}")
+        return
+    
+    if len(data) == 0:
+        print("Ошибка: не удалось загрузить данные")
+        return
+    
+    print(f"Загружено {len(data)} значений")
+    print(f"Первые 10 значений: {data[:10]}")
+    
+    # 2. Расчет характеристик, автокорреляции и аппроксимация закона распределения
+    with Profiler.stage('analysis'):
+        result = analyze_sequence(data, args.sample_sizes, seed=args.seed, fit=args.fit, cache=cache)
+    if cache is not None:
+        print(f"Кэш результатов {args.cache}: найдено этапов {cache.hits}, рассчитано {cache.misses}")
+    
+    if args.table:
+        try:
+            result['form1'].export(args.table)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка записи таблицы: {e}")
+            args.table = None
+    
+    # 3. Вывод результатов и визуализация
+    with Profiler.stage('report'):
+        Visualizer.configure(args.plots, args.plots_dir, args.plot_workers)
+        print_analysis(data, result)
+        saved_plots = Visualizer.close()
+    if saved_plots:
+        print(f"\nГрафики сохранены в {args.plots_dir}: {len(saved_plots)} файлов")
+    if args.table:
+        print(f"Таблица характеристик сохранена: {args.table}")
+    
+    # 4. Характеристики в скользящем окне
+    if args.rolling > 0:
+        window = min(args.rolling, len(data))
+        try:
+            with Profiler.stage('rolling'):
+                rolling = RollingStatistics.calculate(data, window, step=args.rolling_step)
+                drift = RollingStatistics.detect_drift(rolling, window)
+        except ValueError as e:  # например, последовательность короче двух значений
+            print(f"Ошибка расчета в скользящем окне: {e}")
+        else:
+            print_rolling_summary(rolling, drift, window)
+    
+    # 5. Оценка точности характеристик по репликам сгенерированной последовательности
+    if args.replications > 0 and 'generated' in result:
+        with Profiler.stage('replication'):
+            estimates = ReplicationEngine.run(args.replications, len(result['generated']), result['t1'], result['t2'],
+                                              result['q'], workers=args.replication_workers, seed=args.seed,
+                                              reference=(data[:result['reference_size']], *result['histogram'][:2]))
+        print_replication_summary(ReplicationEngine.summarize(estimates), result['reference'], args.replications)
+        print_replication_tests(estimates)
+    
+    if args.profile:
+        write_profile(args.profile)
     
     print("\n=== Анализ завершен ===")
 
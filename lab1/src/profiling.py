@@ -0,0 +1,139 @@
+import contextlib
+import functools
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+class _Stage:
+    """Замер одного вхождения в этап: время, процессорное время и пик выделенной памяти"""
+    
+    __slots__ = ('name', 'wall_start', 'cpu_start', 'memory_start', 'peak')
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __enter__(self):
+        if Profiler.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if Profiler._stack:
+                # Пик родителя до вложенного этапа сохраняется, т.к. reset_peak его сбрасывает
+                parent = Profiler._stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = self.peak = current
+        Profiler._stack.append(self)
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+    
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        Profiler._stack.pop()
+        
+        allocated = 0
+        if Profiler.track_memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            allocated = self.peak - self.memory_start
+            if Profiler._stack:
+                Profiler._stack[-1].peak = max(Profiler._stack[-1].peak, self.peak)
+        
+        record = Profiler._records.setdefault(self.name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                          'peak_bytes': 0})
+        record['calls'] += 1
+        record['wall_seconds'] += wall
+        record['cpu_seconds'] += cpu
+        record['peak_bytes'] = max(record['peak_bytes'], allocated)
+        return False
+
+class Profiler:
+    """Опциональная инструментация этапов конвейера
+    
+    По умолчанию выключена: stage возвращает пустой контекст и не влияет на время
+    работы. После enable для каждого этапа и обернутого метода накапливаются число
+    вызовов, время, процессорное время и пик памяти, выделенной сверх уровня на
+    входе в этап (tracemalloc). Времена вложенных этапов входят в время родителя.
+    """
+    
+    enabled = False
+    track_memory = False
+    _records: Dict[str, Dict[str, Any]] = {}
+    _stack: List[_Stage] = []
+    _started = 0.0
+    
+    @staticmethod
+    def enable(track_memory: bool = True):
+        """Включение замеров (track_memory - учет памяти через tracemalloc, замедляет выделения)"""
+        Profiler.enabled = True
+        Profiler.track_memory = track_memory
+        Profiler._records = {}
+        Profiler._stack = []
+        Profiler._started = time.perf_counter()
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    @staticmethod
+    def disable():
+        """Выключение замеров"""
+        Profiler.enabled = False
+        if Profiler.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        Profiler.track_memory = False
+    
+    @staticmethod
+    def stage(name: str):
+        """Контекст замера этапа с именем name"""
+        if not Profiler.enabled:
+            return contextlib.nullcontext()
+        return _Stage(name)
+    
+    @staticmethod
+    def instrument(cls: type) -> type:
+        """Обертка всех публичных статических методов класса замерами 'Класс.метод'"""
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith('_') or not isinstance(attribute, staticmethod):
+                continue
+            setattr(cls, name, staticmethod(Profiler._wrap(f"{cls.__name__}.{name}", attribute.__func__)))
+        return cls
+    
+    @staticmethod
+    def _wrap(name: str, function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not Profiler.enabled:
+                return function(*args, **kwargs)
+            with _Stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    
+    @staticmethod
+    def report() -> Dict[str, Any]:
+        """Профиль запуска: общее время и записи этапов в порядке первого вызова"""
+        return {
+            'total_wall_seconds': time.perf_counter() - Profiler._started,
+            'memory_tracked': Profiler.track_memory,
+            'stages': [dict(name=name, **record) for name, record in Profiler._records.items()],
+        }
+    
+    @staticmethod
+    def write_json(path: str):
+        """Сохранение профиля в JSON"""
+        with open(path, 'w') as file:
+            json.dump(Profiler.report(), file, indent=2, ensure_ascii=False)
+    
+    @staticmethod
+    def print_summary(limit: Optional[int] = None):
+        """Печать сводной таблицы профиля (по убыванию времени)"""
+        report = Profiler.report()
+        stages = sorted(report['stages'], key=lambda record: -record['wall_seconds'])[:limit]
+        
+        print("\n" + "="*108)
+        print(f"ПРОФИЛЬ ВЫПОЛНЕНИЯ (всего {report['total_wall_seconds']:.3f} с)")
+        print("="*108)
+        print(f"{'Этап':<64} {'Вызовы':>8} {'Время, с':>10} {'ЦП, с':>10} {'Пик, МиБ':>10}")
+        print("-"*108)
+        for record in stages:
+            peak = f"{record['peak_bytes'] / 2**20:.2f}" if report['memory_tracked'] else "-"
+            print(f"{record['name']:<64} {record['calls']:>8} {record['wall_seconds']:>10.4f} "
+                  f"{record['cpu_seconds']:>10.4f} {peak:>10}")
\ No newline at end of file
@@ -0,0 +1,89 @@
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple, Union
+from statistics import StatisticsCalculator
+from distribution import DistributionApproximator
+from goodness_of_fit import GoodnessOfFit
+from utils import BLOCK_VALUES
+
+SUMMARY_QUANTILES = (0.05, 0.5, 0.95)
+
+class ReplicationEngine:
+    """Монте-Карло оценка точности статистических характеристик
+    
+    Генерирует R независимых гиперэкспоненциальных последовательностей длины n
+    блоками по строкам (chunk x n), считает характеристики построчно и
+    возвращает выборочные распределения оценок.
+    """
+    
+    @staticmethod
+    def calculate_row_characteristics(sequences: np.ndarray, max_lag: int = 10,
+                                      confidences: Sequence[float] = (0.9, 0.95, 0.99)) -> Dict[str, np.ndarray]:
+        """Характеристики StatisticsCalculator для каждой строки матрицы (реплики x значения)"""
+        sequences = np.atleast_2d(sequences)
+        n = sequences.shape[1]
+        
+        mean = sequences.mean(axis=1)
+        variance = sequences.var(axis=1, ddof=1) if n > 1 else np.full(len(sequences), np.nan)
+        std = np.sqrt(variance)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variation = np.where(mean != 0, std / mean, 0)
+        
+        result = {'mean': mean, 'variance': variance, 'std': std, 'variation': variation}
+        critical = StatisticsCalculator.critical_values(confidences, [n])[:, 0]
+        for confidence, value in zip(confidences, critical):
+            result[StatisticsCalculator.confidence_key(confidence)] = value * std / np.sqrt(n) if n > 1 else np.zeros(len(sequences))
+        result['autocorrelation'] = StatisticsCalculator.calculate_autocorrelation_fft(sequences, max_lag)
+        return result
+    
+    @staticmethod
+    def _run_chunk(seed: np.random.SeedSequence, replications: int, size: int, t1: float, t2: float, q: float,
+                   max_lag: int, confidences: Sequence[float], reference: Optional[Tuple] = None) -> Dict[str, np.ndarray]:
+        """Генерация и анализ одного блока реплик (выполняется и в рабочих процессах)"""
+        sequences = DistributionApproximator.generate_hyperexponential_replications(replications, size, t1, t2, q, seed)
+        result = ReplicationEngine.calculate_row_characteristics(sequences, max_lag, confidences)
+        if reference is not None:
+            reference_sample, reference_counts, bin_edges = reference
+            result.update(GoodnessOfFit.compare(reference_sample, sequences, reference_counts, bin_edges))
+        return result
+    
+    @staticmethod
+    def run(replications: int, size: int, t1: float, t2: float, q: float = 0.3, max_lag: int = 10,
+            confidences: Sequence[float] = (0.9, 0.95, 0.99), chunk_size: Optional[int] = None, workers: int = 0,
+            seed: Optional[Union[int, np.random.SeedSequence]] = None,
+            reference: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """Оценки характеристик по replications репликам объема size
+        
+        chunk_size - число реплик в блоке (по умолчанию около BLOCK_VALUES значений);
+        workers > 0 - блоки распределяются по процессам. Каждый блок получает
+        независимый поток случайных чисел от SeedSequence(seed).spawn, поэтому
+        результат при заданном seed не зависит от числа процессов. reference -
+        (исходная последовательность, ее частоты, границы интервалов): для каждой
+        реплики добавляются критерии согласия GoodnessOfFit.compare.
+        """
+        chunk_size = chunk_size or max(1, BLOCK_VALUES // max(size, 1))
+        chunk_sizes = [min(chunk_size, replications - start) for start in range(0, replications, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        tasks = [(chunk_seed, rows, size, t1, t2, q, max_lag, tuple(confidences), reference)
+                 for chunk_seed, rows in zip(seeds, chunk_sizes)]
+        
+        if workers > 0 and len(tasks) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                parts = list(executor.map(ReplicationEngine._run_chunk, *zip(*tasks)))
+        else:
+            parts = [ReplicationEngine._run_chunk(*task) for task in tasks]
+        
+        return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]} if parts else {}
+    
+    @staticmethod
+    def summarize(estimates: Dict[str, np.ndarray],
+                  quantiles: Sequence[float] = SUMMARY_QUANTILES) -> Dict[str, Dict[str, np.ndarray]]:
+        """Выборочное распределение каждой оценки: среднее, СКО и квантили (по сдвигам для автокорреляции)"""
+        summary = {}
+        for key, values in estimates.items():
+            summary[key] = {
+                'mean': np.nanmean(values, axis=0),
+                'std': np.nanstd(values, axis=0, ddof=1) if len(values) > 1 else np.zeros_like(values[0]),
+                'quantiles': np.nanquantile(values, quantiles, axis=0),
+            }
+        return summary
@@ -0,0 +1,187 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import numpy as np
+from typing import List, Dict, Any, Optional, Sequence
+
+# Форматы экспорта по расширению файла
+EXPORT_FORMATS = {'.csv': 'csv', '.json': 'json', '.parquet': 'parquet'}
+# Библиотеки, через которые pandas записывает Parquet
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+class CharacteristicsTable:
+    """Столбцовая таблица характеристик по размерам выборки
+    
+    Значения хранятся одной матрицей (размеры выборки x характеристики):
+    table['mean'] - столбец характеристики, table.sample_sizes - размеры
+    выборки строк. source - необязательная метка строки (например, имя файла)
+    для таблиц, объединенных из нескольких последовательностей.
+    """
+    
+    def __init__(self, sample_sizes: Sequence[int], names: Sequence[str], values: np.ndarray,
+                 source: Optional[Sequence[str]] = None):
+        self.sample_sizes = np.asarray(sample_sizes, dtype=np.int64)
+        self.names = list(names)
+        self.values = np.asarray(values, dtype=float).reshape(len(self.sample_sizes), len(self.names))
+        self.source = None if source is None else np.asarray(source, dtype=str)
+        self._index = {name: i for i, name in enumerate(self.names)}
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], names: Sequence[str],
+                     sample_sizes: Optional[Sequence[int]] = None) -> 'CharacteristicsTable':
+        """Таблица из словаря столбцов (например, calculate_prefix_characteristics)"""
+        sample_sizes = columns['n'] if sample_sizes is None else sample_sizes
+        return cls(sample_sizes, names, np.column_stack([columns[name] for name in names]))
+    
+    @classmethod
+    def concatenate(cls, tables: Sequence['CharacteristicsTable'],
+                    sources: Optional[Sequence[str]] = None) -> 'CharacteristicsTable':
+        """Объединение таблиц с одинаковыми характеристиками; sources - метки таблиц"""
+        if not tables:
+            raise ValueError("Нет таблиц для объединения")
+        names = tables[0].names
+        if any(table.names != names for table in tables):
+            raise ValueError("Таблицы с разным набором характеристик нельзя объединить")
+        
+        if sources is not None:
+            labels = np.repeat(np.asarray(sources, dtype=str), [len(table) for table in tables])
+        elif all(table.source is not None for table in tables):
+            labels = np.concatenate([table.source for table in tables])
+        else:
+            labels = None
+        return cls(np.concatenate([table.sample_sizes for table in tables]), names,
+                   np.concatenate([table.values for table in tables]), labels)
+    
+    def __len__(self) -> int:
+        return len(self.sample_sizes)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Столбец характеристики name"""
+        return self.values[:, self._index[name]]
+    
+    def keys(self) -> List[str]:
+        return list(self.names)
+    
+    def row(self, index: int) -> Dict[str, float]:
+        """Характеристики одной строки в виде словаря"""
+        return dict(zip(self.names, self.values[index].tolist()))
+    
+    def take(self, indices: Sequence[int]) -> 'CharacteristicsTable':
+        """Подтаблица из строк indices (номера или логическая маска)"""
+        return CharacteristicsTable(self.sample_sizes[indices], self.names, self.values[indices],
+                                    None if self.source is None else self.source[indices])
+    
+    def relative_deviations(self, reference_index: Optional[int] = None) -> 'CharacteristicsTable':
+        """Относительные отклонения (%) всех характеристик от строки reference_index
+        
+        По умолчанию эталонная строка - наибольший размер выборки. Характеристики
+        с нулевым эталонным значением получают нулевые отклонения.
+        """
+        if reference_index is None:
+            reference_index = int(np.argmax(self.sample_sizes))
+        reference = self.values[reference_index]
+        safe = np.where(reference != 0, reference, 1)
+        relative = np.where(reference != 0, np.abs((self.values - reference) / safe) * 100, 0)
+        return CharacteristicsTable(self.sample_sizes, self.names, relative, self.source)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Столбцовое представление: размеры выборки, метки и списки значений характеристик"""
+        result = {'sample_sizes': self.sample_sizes.tolist()}
+        if self.source is not None:
+            result['source'] = self.source.tolist()
+        result['columns'] = {name: self.values[:, i].tolist() for i, name in enumerate(self.names)}
+        return result
+    
+    def to_dataframe(self):
+        """pandas.DataFrame со столбцами source (если есть), n и характеристиками"""
+        import pandas as pd
+        frame = pd.DataFrame(self.values, columns=self.names)
+        frame.insert(0, 'n', self.sample_sizes)
+        if self.source is not None:
+            frame.insert(0, 'source', self.source)
+        return frame
+    
+    def to_csv(self, path: str):
+        """Запись в CSV (числа с точностью, достаточной для обратного чтения без потерь)"""
+        buffer = io.StringIO()
+        np.savetxt(buffer, self.values, fmt='%.17g', delimiter=',')
+        lines = buffer.getvalue().splitlines()
+        prefixes = self.sample_sizes.astype(str)
+        header = ['n'] + self.names
+        if self.source is not None:
+            prefixes = np.char.add(np.char.add([_quote_csv(label) for label in self.source], ','), prefixes)
+            header = ['source'] + header
+        
+        with open(path, 'w', newline='') as file:
+            file.write(','.join(header) + '\n')
+            file.writelines(f"{prefix},{line}\n" for prefix, line in zip(prefixes, lines))
+    
+    def to_json(self, path: str):
+        """Запись в JSON в столбцовом виде (to_dict)"""
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False)
+    
+    def to_parquet(self, path: str):
+        """Запись в Parquet через pandas (требуется pyarrow или fastparquet)"""
+        self.to_dataframe().to_parquet(path, index=False)
+    
+    @staticmethod
+    def check_export_path(path: str) -> str:
+        """Формат записи для пути path; ValueError, если формат неизвестен или недоступен
+        
+        Вызывается до расчета, чтобы ошибка в пути таблицы не обнаруживалась
+        только после завершения анализа.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in EXPORT_FORMATS:
+            raise ValueError(f"Неизвестный формат таблицы: {extension} (поддерживаются {', '.join(EXPORT_FORMATS)})")
+        if EXPORT_FORMATS[extension] == 'parquet' and not any(
+                importlib.util.find_spec(engine) for engine in PARQUET_ENGINES):
+            raise ValueError(f"Для записи Parquet требуется {' или '.join(PARQUET_ENGINES)} "
+                             f"(установка: pip install pyarrow)")
+        return EXPORT_FORMATS[extension]
+    
+    def export(self, path: str):
+        """Запись в формате, определяемом расширением файла (.csv, .json, .parquet)"""
+        getattr(self, f"to_{self.check_export_path(path)}")(path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'CharacteristicsTable':
+        """Чтение таблицы, сохраненной export"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.json':
+            with open(path) as file:
+                content = json.load(file)
+            columns = content['columns']
+            return cls(content['sample_sizes'], list(columns), np.column_stack(list(columns.values())),
+                       content.get('source'))
+        
+        if extension == '.parquet':
+            import pandas as pd
+            frame = pd.read_parquet(path)
+            header = list(frame.columns)
+            source = frame['source'].to_numpy() if 'source' in frame else None
+            names = [name for name in header if name not in ('source', 'n')]
+            return cls(frame['n'].to_numpy(), names, frame[names].to_numpy(dtype=float), source)
+        
+        if extension == '.csv':
+            with open(path, newline='') as file:
+                rows = list(csv.reader(file))
+            header, rows = rows[0], rows[1:]
+            offset = 1 if header[0] == 'source' else 0
+            source = [row[0] for row in rows] if offset else None
+            values = np.array([row[offset + 1:] for row in rows], dtype=float)
+            return cls([int(row[offset]) for row in rows], header[offset + 1:], values, source)
+        
+        raise ValueError(f"Неизвестный формат таблицы: {extension}")
+
+def _quote_csv(value: str) -> str:
+    """Экранирование текстового значения для CSV"""
+    if any(character in value for character in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
\ No newline at end of file
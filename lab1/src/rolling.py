@@ -0,0 +1,301 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+from statistics import StatisticsCalculator
+from utils import BLOCK_VALUES
+
+# Во сколько раз size * (среднее - сдвиг)**2 или квадрат ушедшего из окна значения
+# может превышать сумму квадратов отклонений окна, прежде чем RollingWindow
+# пересчитает суммы от нового сдвига (иначе точность теряется при вычитании)
+RESYNC_RATIO = 1e4
+
+class RollingStatistics:
+    """Характеристики в скользящем окне для всей последовательности
+    
+    Для окон длины window, заканчивающихся через каждые step значений,
+    рассчитываются среднее, несмещенная дисперсия, СКО, коэффициент вариации и
+    коэффициенты автокорреляции для сдвигов 1..max_lag (в том же определении,
+    что и StatisticsCalculator.calculate_autocorrelation для окна). Суммы окон
+    берутся из накопленных сумм, идущих от точки внутри окна (_centered_sums),
+    поэтому расчет не зависит от длины окна и точен при смене уровня;
+    последовательность обрабатывается блоками, и память ограничена размером
+    блока и результата.
+    """
+    
+    @staticmethod
+    def _centered_sums(head: np.ndarray, tail: Optional[np.ndarray], starts: np.ndarray,
+                       length: int) -> Dict[str, np.ndarray]:
+        """Суммы по отрезкам t = s..s + length - 1 для начал starts, центрированные внутри отрезка
+        
+        Отклонения y = head[t] - c и z = tail[t] - c (без tail - только y) берутся
+        от значения c = head[j * length] в точке сетки с шагом length, лежащей
+        внутри отрезка, и накапливаются от нее в обе стороны. Так складываются
+        только значения самого отрезка, и смена уровня вне его не влияет на
+        точность: квадрат отклонения c от среднего отрезка не больше суммы
+        квадратов отклонений.
+        """
+        grid = -(-starts // length)
+        rows = int(grid.max()) + 1
+        
+        def reshape(values: np.ndarray) -> np.ndarray:
+            padded = np.zeros(rows * length)
+            used = min(len(values), len(padded))
+            padded[:used] = values[:used]
+            return padded.reshape(rows, length)
+        
+        head_rows = reshape(head)
+        tail_rows = None if tail is None else reshape(tail)
+        centers = head_rows[:, 0].copy()
+        right = starts + length - grid * length  # значений от точки сетки вправо (1..length)
+        left = length - right  # значений левее точки сетки (из предыдущей строки)
+        has_left = left > 0
+        # Номера накопленных сумм в развернутых массивах строк
+        right_index = grid * length + right - 1
+        left_index = np.minimum(np.maximum(grid - 1, 0), max(rows - 2, 0)) * length + np.maximum(left - 1, 0)
+        
+        def deviations(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            # Вправо - строка j от центра j; влево - строка j - 1 в обратном порядке от центра j
+            return matrix - centers[:, None], matrix[:-1, ::-1] - centers[1:, None]
+        
+        def collect(right_terms: np.ndarray, left_terms: np.ndarray) -> np.ndarray:
+            # Слагаемые - временные массивы, поэтому накопление выполняется на месте
+            total = np.cumsum(right_terms, axis=1, out=right_terms).ravel().take(right_index)
+            if len(left_terms):
+                left_sums = np.cumsum(left_terms, axis=1, out=left_terms).ravel().take(left_index)
+                total += np.where(has_left, left_sums, 0.0)
+            return total
+        
+        head_right, head_left = deviations(head_rows)
+        sums = {'center': centers[grid],
+                'head_sq': collect(head_right * head_right, head_left * head_left)}
+        if tail_rows is not None:
+            tail_right, tail_left = deviations(tail_rows)
+            sums['tail_sq'] = collect(tail_right * tail_right, tail_left * tail_left)
+            sums['products'] = collect(head_right * tail_right, head_left * tail_left)
+            sums['tail_sum'] = collect(tail_right, tail_left)
+        sums['head_sum'] = collect(head_right, head_left)
+        return sums
+    
+    @staticmethod
+    def _block(segment: np.ndarray, starts: np.ndarray, window: int, max_lag: int) -> Dict[str, np.ndarray]:
+        """Характеристики окон segment[s:s + window] для начал starts"""
+        sums = RollingStatistics._centered_sums(segment, None, starts, window)
+        window_sum, window_squares = sums['head_sum'], sums['head_sq']
+        mean = sums['center'] + window_sum / window
+        variance = np.maximum(window_squares - window_sum * window_sum / window, 0) / (window - 1)
+        std = np.sqrt(variance)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variation = np.where(mean != 0, std / mean, 0)
+        
+        autocorrelation = np.zeros((len(starts), max_lag))
+        for lag in range(1, min(max_lag, window - 1) + 1):
+            # Пары (t, t + lag) окна: t пробегает первые window - lag значений окна
+            pairs = RollingStatistics._centered_sums(segment[:-lag], segment[lag:], starts, window - lag)
+            autocorrelation[:, lag - 1] = StatisticsCalculator._lagged_correlation(
+                pairs['products'], pairs['head_sum'], pairs['tail_sum'],
+                pairs['head_sq'], pairs['tail_sq'], window - lag)
+        
+        return {'mean': mean, 'variance': variance, 'std': std, 'variation': variation,
+                'autocorrelation': autocorrelation}
+    
+    @staticmethod
+    def calculate(data: np.ndarray, window: int, max_lag: int = 1, step: int = 1,
+                  block_values: int = BLOCK_VALUES) -> Dict[str, np.ndarray]:
+        """Характеристики всех окон: массивы по окнам и 'end' - индекс за последним значением окна
+        
+        'autocorrelation' - матрица (окна x сдвиги).
+        """
+        n = len(data)
+        if not 2 <= window <= n:
+            raise ValueError(f"Длина окна должна быть от 2 до {n}")
+        if step < 1:
+            raise ValueError("Шаг окна должен быть положительным")
+        
+        ends = np.arange(window, n + 1, step)
+        windows_per_block = max(1, block_values // step)
+        parts = []
+        for first in range(0, len(ends), windows_per_block):
+            block_ends = ends[first:first + windows_per_block]
+            offset = block_ends[0] - window
+            segment = np.asarray(data[offset:block_ends[-1]], dtype=float)
+            parts.append(RollingStatistics._block(segment, block_ends - block_ends[0], window, max_lag))
+        
+        result = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        result['end'] = ends
+        return result
+    
+    @staticmethod
+    def detect_drift(rolling: Dict[str, np.ndarray], window: int, reference_mean: Optional[float] = None,
+                     reference_std: Optional[float] = None, threshold: float = 3.0) -> Dict[str, np.ndarray]:
+        """Отметка окон со сменой режима
+        
+        Среднее окна сравнивается с эталонным (по умолчанию - медианы средних и
+        СКО по всем окнам, устойчивые к смене режима на меньшей части
+        последовательности) в единицах стандартной ошибки reference_std /
+        sqrt(window), коэффициент
+        автокорреляции первого сдвига - с его стандартной ошибкой 1 / sqrt(window).
+        Окно отмечается, если любая из величин по модулю больше threshold.
+        """
+        if reference_mean is None:
+            reference_mean = np.median(rolling['mean'])
+        if reference_std is None:
+            reference_std = np.median(rolling['std'])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_z = (rolling['mean'] - reference_mean) * np.sqrt(window) / reference_std
+        mean_z = np.nan_to_num(mean_z, nan=0.0)
+        acf_z = rolling['autocorrelation'][:, 0] * np.sqrt(window)
+        drift = (np.abs(mean_z) > threshold) | (np.abs(acf_z) > threshold)
+        return {'mean_z': mean_z, 'acf_z': acf_z, 'drift': drift}
+
+class RollingWindow:
+    """Скользящее окно для потока значений
+    
+    push добавляет одно значение за O(max_lag): суммы значений, квадратов и
+    произведений со сдвигом обновляются по входящему и выходящему значениям, а
+    характеристики текущего окна доступны в любой момент. extend обрабатывает
+    блок значений векторно и возвращает характеристики всех окон, заканчивающихся
+    на значениях блока. Суммы периодически пересчитываются по буферу, чтобы
+    ошибки округления не накапливались на длинных потоках, и сразу же, если
+    уровень окна ушел далеко от сдвига или из окна ушло большое значение
+    (RESYNC_RATIO).
+    """
+    
+    def __init__(self, window: int, max_lag: int = 1):
+        if window < 2:
+            raise ValueError("Длина окна должна быть не меньше 2")
+        if not 1 <= max_lag < window:
+            raise ValueError("Сдвиг автокорреляции должен быть от 1 до длины окна - 1")
+        self.window = window
+        self.max_lag = max_lag
+        self.count = 0  # всего значений в потоке
+        self._buffer = np.zeros(window)  # кольцевой буфер значений окна (со сдвигом)
+        self._position = 0  # позиция следующей записи в буфере
+        self._shift = None
+        self._sum = 0.0
+        self._square_sum = 0.0
+        self._products = np.zeros(max_lag)  # суммы y[t] * y[t + k] по парам внутри окна
+        self._since_resync = 0
+    
+    @property
+    def size(self) -> int:
+        """Число значений в окне"""
+        return min(self.count, self.window)
+    
+    def values(self) -> np.ndarray:
+        """Значения окна в порядке поступления"""
+        ordered = np.roll(self._buffer, -self._position)[self.window - self.size:]
+        return ordered + (self._shift or 0.0)
+    
+    def _resync(self):
+        """Пересчет сумм по буферу
+        
+        Сдвиг переносится на последнее значение окна, чтобы после смены уровня
+        потока суммы снова считались по малым отклонениям.
+        """
+        values = self.values()
+        shift = float(values[-1]) if len(values) else self._shift
+        self._buffer += self._shift - shift
+        self._shift = shift
+        values = values - shift
+        self._sum = values.sum()
+        self._square_sum = np.dot(values, values)
+        for lag in range(1, self.max_lag + 1):
+            self._products[lag - 1] = np.dot(values[:-lag], values[lag:]) if lag < len(values) else 0.0
+        self._since_resync = 0
+    
+    def push(self, value: float):
+        """Добавление одного значения"""
+        if self._shift is None:
+            self._shift = float(value)
+        y = float(value) - self._shift
+        size = self.size
+        
+        for lag in range(1, min(self.max_lag, size) + 1):
+            # Новая пара (y[t - k], y[t]) и, если окно заполнено, уходящая пара (y[t - w], y[t - w + k])
+            self._products[lag - 1] += self._buffer[(self._position - lag) % self.window] * y
+            if size == self.window:
+                self._products[lag - 1] -= self._buffer[self._position] * self._buffer[(self._position + lag) % self.window]
+        
+        outgoing = 0.0
+        if size == self.window:
+            outgoing = self._buffer[self._position]
+            self._sum -= outgoing
+            self._square_sum -= outgoing * outgoing
+        self._buffer[self._position] = y
+        self._position = (self._position + 1) % self.window
+        self._sum += y
+        self._square_sum += y * y
+        self.count += 1
+        
+        self._since_resync += 1
+        size = self.size
+        deviation = self._square_sum - self._sum * self._sum / size
+        drifted = max(self._sum * self._sum / size, outgoing * outgoing) > RESYNC_RATIO * deviation
+        if self._since_resync >= self.window or drifted:
+            self._resync()
+    
+    def extend(self, chunk: np.ndarray) -> Dict[str, np.ndarray]:
+        """Добавление блока значений; характеристики окон, заканчивающихся на значениях блока
+        
+        Окна учитываются только после накопления window значений.
+        """
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if len(chunk) == 0:
+            return {}
+        if self._shift is None:
+            self._shift = float(chunk[0])
+        
+        history = self.values()
+        combined = np.concatenate((history, chunk))
+        result = {}
+        if len(combined) >= self.window:
+            result = RollingStatistics.calculate(combined, self.window, self.max_lag)
+            result['end'] += self.count - len(history)  # позиции в потоке
+            # Окно, заканчивающееся на уже полученном значении, было возвращено раньше
+            new = result['end'] > self.count
+            if not new.all():
+                result = {key: values[new] for key, values in result.items()}
+        
+        tail = combined[-self.window:] - self._shift
+        self._buffer[:] = 0.0
+        self._buffer[self.window - len(tail):] = tail
+        self._position = 0
+        self.count += len(chunk)
+        self._resync()
+        return result
+    
+    @property
+    def mean(self) -> float:
+        return self._shift + self._sum / self.size if self.size else np.nan
+    
+    @property
+    def variance(self) -> float:
+        size = self.size
+        if size < 2:
+            return np.nan
+        return max(self._square_sum - self._sum * self._sum / size, 0.0) / (size - 1)
+    
+    @property
+    def std(self) -> float:
+        return np.sqrt(self.variance)
+    
+    @property
+    def variation_coefficient(self) -> float:
+        mean = self.mean
+        return self.std / mean if mean != 0 else 0
+    
+    def autocorrelation(self) -> np.ndarray:
+        """Коэффициенты автокорреляции окна для сдвигов 1..max_lag (за O(max_lag))"""
+        size = self.size
+        lags = np.arange(1, self.max_lag + 1)
+        steps = np.arange(min(self.max_lag, size))
+        # Суммы первых и последних k значений окна по кольцевому буферу
+        first = self._buffer[(self._position - size + steps) % self.window]
+        last = self._buffer[(self._position - 1 - steps) % self.window]
+        first_sums = np.concatenate(([0.0], np.cumsum(first)))[np.minimum(lags, len(steps))]
+        last_sums = np.concatenate(([0.0], np.cumsum(last)))[np.minimum(lags, len(steps))]
+        first_squares = np.concatenate(([0.0], np.cumsum(first * first)))[np.minimum(lags, len(steps))]
+        last_squares = np.concatenate(([0.0], np.cumsum(last * last)))[np.minimum(lags, len(steps))]
+        return StatisticsCalculator._lagged_correlation(
+            self._products.copy(), self._sum - last_sums, self._sum - first_sums,
+            self._square_sum - last_squares, self._square_sum - first_squares, size - lags)
\ No newline at end of file
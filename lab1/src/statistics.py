@@ -1,10 +1,24 @@
+import copy
 import numpy as np
-from scipy import stats
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterable, Optional, Sequence
+from histogram import StreamingHistogram
+from utils import BLOCK_VALUES
+
+# Порог n * max_lag, начиная с которого автокорреляция считается через БПФ
+AUTOCORRELATION_FFT_THRESHOLD = 20_000
+# Объем выборки, начиная с которого вместо t-распределения используется нормальное
+NORMAL_APPROXIMATION_SIZE = 30
+# Длина блока, внутри которого префиксные моменты считаются накопленными суммами
+PREFIX_BLOCK_SIZE = 4096
+# Число сдвигов, начиная с которого взаимная корреляция считается через БПФ
+CROSS_CORRELATION_FFT_LAGS = 128
 
 class StatisticsCalculator:
     """Класс для расчета статистических характеристик"""
     
+    # Кэш квантилей: (уровень доверия, степени свободы; 0 - нормальное распределение) -> значение
+    _critical_cache: Dict[Tuple[float, int], float] = {}
+    
     @staticmethod
     def calculate_mean(data: np.ndarray) -> float:
         """Расчет математического ожидания"""
@@ -34,22 +48,175 @@ class StatisticsCalculator:
         if n < 2:
             return 0
         
-        mean = StatisticsCalculator.calculate_mean(data)
         std = StatisticsCalculator.calculate_std(data)
         sem = std / np.sqrt(n)  # стандартная ошибка среднего
         
-        # Используем t-распределение для малых выборок
-        if n < 30:
-            t_value = stats.t.ppf((1 + confidence) / 2, n - 1)
-        else:
-            t_value = stats.norm.ppf((1 + confidence) / 2)
+        # t-распределение для малых выборок, нормальное - для больших
+        t_value = StatisticsCalculator.critical_values([confidence], [n])[0, 0]
         
         return t_value * sem
     
     @staticmethod
-    def calculate_autocorrelation(data: np.ndarray, max_lag: int = 10) -> List[float]:
-        """Расчет коэффициентов автокорреляции"""
+    def calculate_confidence_intervals(data: np.ndarray, confidences: Sequence[float],
+                                       sample_sizes: Sequence[int]) -> np.ndarray:
+        """Доверительные интервалы для всех уровней доверия и префиксов data[:n] одним вызовом
+        
+        Возвращает матрицу (уровни доверия x объемы выборки).
+        """
+        prefix = StatisticsCalculator.calculate_prefix_characteristics(data, sample_sizes, confidences=())
+        counts = np.clip(prefix['n'], 0, len(data))
+        sem = prefix['std'] / np.sqrt(np.maximum(counts, 1))
+        critical = StatisticsCalculator.critical_values(confidences, counts)
+        return np.where(counts < 2, 0, critical * sem)
+    
+    @staticmethod
+    def confidence_key(confidence: float) -> str:
+        """Имя характеристики доверительного интервала: 0.95 -> 'ci_95'"""
+        return f"ci_{round(confidence * 100)}"
+    
+    @staticmethod
+    def critical_values(confidences: Sequence[float], sizes: Sequence[int]) -> np.ndarray:
+        """Матрица критических значений (уровни доверия x объемы выборки)
+        
+        Для n < 30 - квантиль t-распределения с n - 1 степенями свободы, иначе
+        нормального. Квантили кэшируются по (уровень, степени свободы), поэтому
+        scipy вызывается только для еще не встречавшихся сочетаний.
+        """
+        confidences = np.atleast_1d(np.asarray(confidences, dtype=float))
+        sizes = np.atleast_1d(np.asarray(sizes, dtype=np.int64))
+        
+        # Степени свободы; 0 обозначает нормальное распределение
+        degrees = np.where(sizes < NORMAL_APPROXIMATION_SIZE, np.maximum(sizes - 1, 1), 0)
+        unique_degrees, inverse = np.unique(degrees, return_inverse=True)
+        keys = [[(round(float(c), 12), int(df)) for df in unique_degrees] for c in confidences]
+        
+        cache = StatisticsCalculator._critical_cache
+        missing = [key for row in keys for key in row if key not in cache]
+        if missing:
+            from scipy import stats
+            
+            levels, dfs = (np.array(values) for values in zip(*missing))
+            p = (1 + levels) / 2
+            values = np.where(dfs > 0, stats.t.ppf(p, np.maximum(dfs, 1)), stats.norm.ppf(p))
+            cache.update(zip(missing, values.tolist()))
+        
+        table = np.array([[cache[key] for key in row] for row in keys]).reshape(len(confidences), len(unique_degrees))
+        return table[:, inverse.ravel()]
+    
+    @staticmethod
+    def _prefix_moments(data: np.ndarray, counts: np.ndarray,
+                        block_size: int = PREFIX_BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Объем, среднее и сумма квадратов отклонений (M2) префиксов data[:c] для c из counts
+        
+        Внутри блока длины block_size моменты берутся из накопленных сумм значений,
+        центрированных на первое значение блока, а блоки объединяются формулой Чана,
+        поэтому точность не зависит от длины данных и смены уровня.
+        """
         n = len(data)
+        blocks = -(-n // block_size)
+        padded = np.zeros(blocks * block_size)
+        padded[:n] = data
+        padded = padded.reshape(blocks, block_size)
+        lengths = np.full(blocks, block_size)
+        if blocks:
+            lengths[-1] = n - (blocks - 1) * block_size
+        
+        # Моменты префиксов внутри каждого блока. Значения центрированы на первое
+        # значение блока: квадрат его отклонения от среднего любого префикса блока
+        # не больше M2 префикса, поэтому относительная ошибка M2 ограничена
+        # величиной порядка block_size * eps и при смене уровня внутри блока
+        shifts = padded[:, 0].copy()
+        centered = padded - shifts[:, None]
+        centered[np.arange(block_size)[None, :] >= lengths[:, None]] = 0
+        sums = np.cumsum(centered, axis=1)
+        squares = np.cumsum(centered * centered, axis=1)
+        
+        # Моменты первых j полных блоков (j = 0..blocks) по формуле Чана
+        block_counts = np.zeros(blocks + 1)
+        block_means = np.zeros(blocks + 1)
+        block_m2 = np.zeros(blocks + 1)
+        count, mean, m2 = 0, 0.0, 0.0
+        for j in range(blocks):
+            size = lengths[j]
+            local_mean = shifts[j] + sums[j, size - 1] / size
+            local_m2 = squares[j, size - 1] - sums[j, size - 1] ** 2 / size
+            delta = local_mean - mean
+            count, mean, m2 = (count + size, mean + delta * size / (count + size),
+                               m2 + local_m2 + delta * delta * count * size / (count + size))
+            block_counts[j + 1], block_means[j + 1], block_m2[j + 1] = count, mean, m2
+        
+        # Префикс длины c: первые c // block_size блоков и начало следующего блока
+        counts = np.asarray(counts, dtype=np.int64)
+        full, rest = counts // block_size, counts % block_size
+        partial = np.minimum(full, max(blocks - 1, 0))
+        has_rest = rest > 0
+        index = np.maximum(rest - 1, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rest_sum = np.where(has_rest, sums[partial, index], 0.0) if blocks else np.zeros(len(counts))
+            rest_squares = np.where(has_rest, squares[partial, index], 0.0) if blocks else np.zeros(len(counts))
+            rest_mean = np.where(has_rest, shifts[partial] + rest_sum / np.maximum(rest, 1), 0.0) if blocks else rest_sum
+            rest_m2 = np.where(has_rest, rest_squares - rest_sum * rest_sum / np.maximum(rest, 1), 0.0)
+            
+            head_count, head_mean, head_m2 = block_counts[full], block_means[full], block_m2[full]
+            total = head_count + rest
+            delta = rest_mean - head_mean
+            weight = np.where(total > 0, rest / np.maximum(total, 1), 0.0)
+            mean = head_mean + delta * weight
+            m2 = head_m2 + rest_m2 + delta * delta * head_count * weight
+        return total, mean, np.maximum(m2, 0)
+    
+    @staticmethod
+    def calculate_prefix_characteristics(data: np.ndarray, sample_sizes: Optional[Sequence[int]] = None,
+                                         confidences: Sequence[float] = (0.9, 0.95, 0.99)) -> Dict[str, np.ndarray]:
+        """Расчет характеристик ФОРМЫ 1 для префиксов data[:n] за один проход
+        
+        sample_sizes - произвольная лестница объемов выборки; по умолчанию все
+        префиксы 1..len(data). Объемы больше len(data) усекаются, как и при data[:n].
+        Возвращает словарь массивов ('n', 'mean', 'variance', 'std', 'variation',
+        'ci_90', ...), выровненных по sample_sizes.
+        """
+        data = np.asarray(data, dtype=float)
+        if sample_sizes is None:
+            sizes = np.arange(1, len(data) + 1)
+        else:
+            sizes = np.asarray(sample_sizes, dtype=np.int64)
+        counts = np.clip(sizes, 0, len(data))
+        max_count = int(counts.max()) if len(counts) else 0
+        
+        total, mean, m2 = StatisticsCalculator._prefix_moments(data[:max_count], counts)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(counts > 0, mean, np.nan)
+            variance = np.where(counts > 1, m2 / (counts - 1), np.nan)
+            variance = np.maximum(variance, 0)
+            std = np.sqrt(variance)
+            variation = np.where(mean != 0, std / mean, 0)
+        
+        result = {'n': sizes, 'mean': mean, 'variance': variance, 'std': std, 'variation': variation}
+        
+        sem = std / np.sqrt(np.maximum(counts, 1))
+        critical = StatisticsCalculator.critical_values(confidences, counts) if len(confidences) else []
+        for confidence, row in zip(confidences, critical):
+            result[StatisticsCalculator.confidence_key(confidence)] = np.where(counts < 2, 0, row * sem)
+        
+        return result
+    
+    @staticmethod
+    def calculate_autocorrelation(data: np.ndarray, max_lag: int = 10, method: str = 'auto') -> List[float]:
+        """Расчет коэффициентов автокорреляции
+        
+        method: 'direct' - коэффициент корреляции для каждого сдвига отдельно,
+        'fft' - все сдвиги сразу через БПФ, 'auto' - выбор по объему вычислений.
+        """
+        n = len(data)
+        if method == 'auto':
+            method = 'fft' if n * max_lag > AUTOCORRELATION_FFT_THRESHOLD else 'direct'
+        
+        if method == 'fft':
+            return StatisticsCalculator.calculate_autocorrelation_fft(data, max_lag).tolist()
+        if method != 'direct':
+            raise ValueError(f"Неизвестный метод расчета автокорреляции: {method}")
+        
         autocorrelations = []
         
         for lag in range(1, max_lag + 1):
@@ -62,6 +229,68 @@ class StatisticsCalculator:
         
         return autocorrelations
     
+    @staticmethod
+    def calculate_autocorrelation_fft(data: np.ndarray, max_lag: int = 10) -> np.ndarray:
+        """Расчет коэффициентов автокорреляции для сдвигов 1..max_lag через БПФ
+        
+        Определение совпадает с покомпонентным: для сдвига k это коэффициент
+        корреляции между data[:-k] и data[k:]. Суммы произведений со сдвигом
+        берутся из одного БПФ, суммы отрезков - из накопленных сумм.
+        Двумерный массив обрабатывается построчно.
+        """
+        data = np.asarray(data, dtype=float)
+        n = data.shape[-1]
+        max_lag = max(min(max_lag, n - 1), 0)
+        if max_lag == 0:
+            return np.zeros(data.shape[:-1] + (0,))
+        
+        centered = data - data.mean(axis=-1, keepdims=True)
+        
+        # Дополнение нулями до n + max_lag исключает циклическое наложение
+        nfft = 1 << (n + max_lag - 1).bit_length()
+        spectrum = np.fft.rfft(centered, nfft)
+        products = np.fft.irfft(spectrum * spectrum.conj(), nfft)[..., 1:max_lag + 1]
+        
+        zeros = np.zeros(data.shape[:-1] + (1,))
+        sums = np.concatenate((zeros, np.cumsum(centered, axis=-1)), axis=-1)
+        square_sums = np.concatenate((zeros, np.cumsum(centered * centered, axis=-1)), axis=-1)
+        
+        lags = np.arange(1, max_lag + 1)
+        m = n - lags
+        # Суммы по отрезкам data[:-k] (head) и data[k:] (tail)
+        head_sum, tail_sum = sums[..., m], sums[..., n:] - sums[..., lags]
+        head_sq, tail_sq = square_sums[..., m], square_sums[..., n:] - square_sums[..., lags]
+        
+        return StatisticsCalculator._lagged_correlation(products, head_sum, tail_sum, head_sq, tail_sq, m)
+    
+    @staticmethod
+    def _lagged_correlation(products: np.ndarray, head_sum: np.ndarray, tail_sum: np.ndarray,
+                            head_sq: np.ndarray, tail_sq: np.ndarray, m: np.ndarray) -> np.ndarray:
+        """Коэффициенты корреляции между data[:-k] и data[k:] по суммам отрезков
+        
+        products - суммы произведений со сдвигом, head/tail - суммы и суммы квадратов
+        отрезков data[:-k] и data[k:], m - длины отрезков.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = products - head_sum * tail_sum / m
+            head_var = head_sq - head_sum * head_sum / m
+            tail_var = tail_sq - tail_sum * tail_sum / m
+            correlations = covariance / np.sqrt(head_var * tail_var)
+        
+        correlations = np.clip(correlations, -1, 1)
+        # Для отрезков из одного значения корреляция не определена
+        correlations[~np.isfinite(correlations) | (m < 2)] = 0
+        return correlations
+    
+    @staticmethod
+    def calculate_autocorrelation_bounds(n: int, confidence: float = 0.95) -> float:
+        """Граница значимости коэффициентов автокорреляции (±z / sqrt(n))"""
+        from scipy import stats
+        
+        if n < 1:
+            return 0
+        return stats.norm.ppf((1 + confidence) / 2) / np.sqrt(n)
+    
     @staticmethod
     def calculate_correlation(seq1: np.ndarray, seq2: np.ndarray) -> float:
         """Расчет коэффициента корреляции между двумя последовательностями"""
@@ -71,4 +300,315 @@ class StatisticsCalculator:
             seq2 = seq2[:min_len]
         
         correlation = np.corrcoef(seq1, seq2)[0, 1]
-        return correlation if not np.isnan(correlation) else 0
\ No newline at end of file
+        return correlation if not np.isnan(correlation) else 0
+    
+    @staticmethod
+    def calculate_correlation_matrix(sequences: Sequence[np.ndarray]) -> np.ndarray:
+        """Матрица коэффициентов корреляции всех пар последовательностей (k x k)
+        
+        Как и в calculate_correlation, последовательности усекаются до длины
+        самой короткой, а неопределенные коэффициенты заменяются нулями.
+        """
+        return StatisticsCalculator.calculate_cross_correlation(sequences, 0)[..., 0]
+    
+    @staticmethod
+    def _cross_products_direct(values: np.ndarray, lags: np.ndarray) -> np.ndarray:
+        """Суммы values[i, t] * values[j, t + lag] для всех пар и сдвигов (матричные произведения)"""
+        k, n = values.shape
+        products = np.empty((k, k, len(lags)))
+        for index, lag in enumerate(lags):
+            start, stop = max(0, -lag), n - max(0, lag)
+            products[:, :, index] = values[:, start:stop] @ values[:, start + lag:stop + lag].T
+        return products
+    
+    @staticmethod
+    def _cross_products_fft(values: np.ndarray, lags: np.ndarray) -> np.ndarray:
+        """Те же суммы через БПФ, блоками пар строк для ограничения памяти"""
+        k, n = values.shape
+        # Дополнение нулями до n + max|lag| исключает циклическое наложение
+        nfft = 1 << (n + int(np.abs(lags).max()) - 1).bit_length()
+        spectrum = np.fft.rfft(values, nfft)
+        conjugate = spectrum.conj()
+        indices = lags % nfft  # отрицательные сдвиги - в конце циклического результата
+        
+        block = max(1, int(np.sqrt(BLOCK_VALUES / nfft)))
+        products = np.empty((k, k, len(lags)))
+        for i in range(0, k, block):
+            for j in range(0, k, block):
+                cross = np.fft.irfft(conjugate[i:i + block, None, :] * spectrum[None, j:j + block, :], nfft)
+                products[i:i + block, j:j + block] = cross[..., indices]
+        return products
+    
+    @staticmethod
+    def calculate_cross_correlation(sequences: Sequence[np.ndarray], max_lag: int = 10,
+                                    method: str = 'auto') -> np.ndarray:
+        """Взаимная корреляция всех пар последовательностей для сдвигов -max_lag..max_lag
+        
+        Возвращает массив (k x k x 2*max_lag + 1): элемент [i, j, max_lag + lag] -
+        коэффициент корреляции между x_i[t] и x_j[t + lag] по перекрывающимся
+        отрезкам (для lag > 0 - между x_i[:-lag] и x_j[lag:], как в
+        calculate_autocorrelation). Последовательности усекаются до длины самой
+        короткой. method: 'direct' - матричные произведения для каждого сдвига,
+        'fft' - все сдвиги через БПФ, 'auto' - выбор по числу сдвигов.
+        """
+        if isinstance(sequences, np.ndarray) and sequences.ndim == 2:
+            values = np.asarray(sequences, dtype=float)
+        else:
+            length = min(len(sequence) for sequence in sequences)
+            values = np.array([np.asarray(sequence[:length], dtype=float) for sequence in sequences])
+        k, n = values.shape
+        max_lag = max(min(max_lag, n - 1), 0)
+        lags = np.arange(-max_lag, max_lag + 1)
+        
+        if method == 'auto':
+            method = 'fft' if len(lags) >= CROSS_CORRELATION_FFT_LAGS else 'direct'
+        if method not in ('direct', 'fft'):
+            raise ValueError(f"Неизвестный метод расчета взаимной корреляции: {method}")
+        
+        # Центрирование по среднему строки уменьшает потерю точности в суммах
+        values = values - values.mean(axis=1, keepdims=True)
+        if method == 'fft':
+            products = StatisticsCalculator._cross_products_fft(values, lags)
+        else:
+            products = StatisticsCalculator._cross_products_direct(values, lags)
+        
+        zeros = np.zeros((k, 1))
+        sums = np.concatenate((zeros, np.cumsum(values, axis=1)), axis=1)
+        square_sums = np.concatenate((zeros, np.cumsum(values * values, axis=1)), axis=1)
+        
+        # Отрезки пар: x_i[start:stop] и x_j[start + lag:stop + lag]
+        start = np.maximum(0, -lags)
+        stop = n - np.maximum(0, lags)
+        head_sum = (sums[:, stop] - sums[:, start])[:, None, :]
+        head_sq = (square_sums[:, stop] - square_sums[:, start])[:, None, :]
+        tail_sum = (sums[:, stop + lags] - sums[:, start + lags])[None, :, :]
+        tail_sq = (square_sums[:, stop + lags] - square_sums[:, start + lags])[None, :, :]
+        
+        return StatisticsCalculator._lagged_correlation(products, head_sum, tail_sum, head_sq, tail_sq,
+                                                        n - np.abs(lags))
+
+class StreamingStatistics:
+    """Потоковый накопитель статистических характеристик
+    
+    Принимает последовательность блоками (update) и хранит только сливаемое
+    состояние: объем, среднее и сумму квадратов отклонений, минимум и максимум,
+    суммы произведений со сдвигом для автокорреляции и частоты гистограммы.
+    Накопители соседних частей последовательности (блоков или
+    обработчиков) объединяются через merge в порядке следования частей.
+    Гистограмма ведется StreamingHistogram с bins интервалами (фиксированными
+    при заданном range, иначе адаптивными).
+    """
+    
+    # Число сдвигов, начиная с которого суммы произведений считаются через БПФ
+    FFT_MIN_LAG = 64
+    
+    def __init__(self, max_lag: int = 10, bins: Optional[int] = None, range: Optional[Tuple[float, float]] = None,
+                 shift: Optional[float] = None):
+        self.max_lag = max_lag
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._mean = 0.0
+        self._m2 = 0.0  # сумма квадратов отклонений от среднего
+        
+        # Суммы для автокорреляции ведутся по значениям x - shift
+        self.shift = shift
+        self._sum = 0.0
+        self._square_sum = 0.0
+        self._products = np.zeros(max_lag)  # суммы y[t] * y[t + k], k = 1..max_lag
+        self._head = np.empty(0)  # первые max_lag значений
+        self._tail = np.empty(0)  # последние max_lag значений
+        
+        self.histogram_state = None if bins is None else StreamingHistogram(bins, range)
+    
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[np.ndarray], **kwargs) -> 'StreamingStatistics':
+        """Создание накопителя по последовательности блоков"""
+        accumulator = cls(**kwargs)
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return accumulator
+    
+    @staticmethod
+    def _combine_moments(count_a: int, mean_a: float, m2_a: float,
+                         count_b: int, mean_b: float, m2_b: float) -> Tuple[float, float]:
+        """Объединение среднего и суммы квадратов отклонений двух частей (формула Чана)"""
+        total = count_a + count_b
+        delta = mean_b - mean_a
+        mean = mean_a + delta * count_b / total
+        m2 = m2_a + m2_b + delta * delta * count_a * count_b / total
+        return mean, m2
+    
+    @staticmethod
+    def _lagged_products(values: np.ndarray, offset: int, max_lag: int) -> np.ndarray:
+        """Суммы values[t] * values[t + k], k = 1..max_lag, где t + k >= offset
+        
+        Учитываются только пары, второй элемент которых лежит в values[offset:].
+        """
+        products = np.zeros(max_lag)
+        new_values = values[offset:]
+        if len(new_values) == 0 or max_lag == 0:
+            return products
+        
+        if max_lag < StreamingStatistics.FFT_MIN_LAG:
+            for lag in range(1, max_lag + 1):
+                start = max(offset - lag, 0)
+                if start + lag < len(values):
+                    products[lag - 1] = values[start:len(values) - lag] @ values[start + lag:]
+            return products
+        
+        # r[s] = сумма new_values[j] * values[j + s]; нужный сдвиг s = offset - k
+        nfft = 1 << (len(values) + len(new_values) - 1).bit_length()
+        spectrum = np.fft.rfft(values, nfft) * np.fft.rfft(new_values, nfft).conj()
+        correlation = np.fft.irfft(spectrum, nfft)
+        lags = np.arange(1, max_lag + 1)
+        products = correlation[(offset - lags) % nfft]
+        products[lags >= len(values)] = 0
+        return products
+    
+    def update(self, chunk: np.ndarray) -> 'StreamingStatistics':
+        """Добавление очередного блока последовательности"""
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        size = len(chunk)
+        if size == 0:
+            return self
+        if self.shift is None:
+            self.shift = float(chunk[0])
+        
+        chunk_mean = float(np.mean(chunk))
+        deviations = chunk - chunk_mean
+        chunk_m2 = float(deviations @ deviations)
+        if self.count == 0:
+            self._mean, self._m2 = chunk_mean, chunk_m2
+        else:
+            self._mean, self._m2 = self._combine_moments(self.count, self._mean, self._m2,
+                                                         size, chunk_mean, chunk_m2)
+        self.count += size
+        self.min = min(self.min, float(chunk.min()))
+        self.max = max(self.max, float(chunk.max()))
+        
+        shifted = chunk - self.shift
+        self._sum += float(shifted.sum())
+        self._square_sum += float(shifted @ shifted)
+        self._products += self._lagged_products(np.concatenate((self._tail - self.shift, shifted)),
+                                                len(self._tail), self.max_lag)
+        
+        if len(self._head) < self.max_lag:
+            self._head = np.concatenate((self._head, chunk[:self.max_lag - len(self._head)]))
+        if self.max_lag:
+            self._tail = np.concatenate((self._tail, chunk[-self.max_lag:]))[-self.max_lag:]
+        
+        if self.histogram_state is not None:
+            self.histogram_state.update(chunk)
+        
+        return self
+    
+    def _segment_sums(self, shift: float) -> Tuple[np.ndarray, ...]:
+        """Суммы и суммы квадратов первых и последних k значений (k = 1..max_lag)"""
+        head = self._head - shift
+        tail = self._tail[::-1] - shift
+        zeros = np.zeros(self.max_lag)
+        
+        def prefix(values: np.ndarray) -> np.ndarray:
+            sums = zeros.copy()
+            sums[:len(values)] = np.cumsum(values)
+            return sums
+        
+        return prefix(head), prefix(head * head), prefix(tail), prefix(tail * tail)
+    
+    def _shifted_state(self, shift: float) -> Tuple[float, float, np.ndarray]:
+        """Суммы для автокорреляции, пересчитанные к другому сдвигу значений"""
+        delta = self.shift - shift  # x - shift = (x - self.shift) + delta
+        lags = np.arange(1, self.max_lag + 1)
+        head_sum, _, tail_sum, _ = self._segment_sums(self.shift)
+        
+        # Суммы по отрезкам y[:-k] и y[k:] в старом сдвиге
+        pair_sums = 2 * self._sum - tail_sum - head_sum
+        pairs = np.maximum(self.count - lags, 0)
+        products = self._products + np.where(pairs > 0, delta * pair_sums + pairs * delta * delta, 0)
+        
+        total = self._sum + self.count * delta
+        square_total = self._square_sum + 2 * delta * self._sum + self.count * delta * delta
+        return total, square_total, products
+    
+    def merge(self, other: 'StreamingStatistics') -> 'StreamingStatistics':
+        """Объединение с накопителем части последовательности, следующей за текущей"""
+        if other.max_lag != self.max_lag:
+            raise ValueError("Накопители с разным max_lag нельзя объединить")
+        if (self.histogram_state is None) != (other.histogram_state is None):
+            raise ValueError("Накопители с гистограммой и без нее нельзя объединить")
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        
+        other_sum, other_square_sum, other_products = other._shifted_state(self.shift)
+        
+        # Пары, у которых первый элемент в текущей части, а второй - в следующей
+        boundary = np.concatenate((self._tail, other._head)) - self.shift
+        boundary_products = self._lagged_products(boundary, len(self._tail), self.max_lag) - \
+            self._lagged_products(boundary[len(self._tail):], 0, self.max_lag)
+        
+        self._products += other_products + boundary_products
+        self._sum += other_sum
+        self._square_sum += other_square_sum
+        
+        self._mean, self._m2 = self._combine_moments(self.count, self._mean, self._m2,
+                                                     other.count, other._mean, other._m2)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        
+        if len(self._head) < self.max_lag:
+            self._head = np.concatenate((self._head, other._head))[:self.max_lag]
+        if self.max_lag:
+            self._tail = np.concatenate((self._tail, other._tail))[-self.max_lag:]
+        
+        if self.histogram_state is not None:
+            self.histogram_state.merge(other.histogram_state)
+        
+        return self
+    
+    def mean(self) -> float:
+        """Математическое ожидание"""
+        return self._mean if self.count else np.nan
+    
+    def variance(self) -> float:
+        """Несмещенная дисперсия"""
+        return self._m2 / (self.count - 1) if self.count > 1 else np.nan
+    
+    def std(self) -> float:
+        """Среднеквадратическое отклонение"""
+        return np.sqrt(self.variance())
+    
+    def variation_coefficient(self) -> float:
+        """Коэффициент вариации"""
+        mean = self.mean()
+        return self.std() / mean if mean != 0 else 0
+    
+    def confidence_interval(self, confidence: float = 0.95) -> float:
+        """Доверительный интервал для математического ожидания"""
+        if self.count < 2:
+            return 0
+        critical = StatisticsCalculator.critical_values([confidence], [self.count])[0, 0]
+        return float(critical * self.std() / np.sqrt(self.count))
+    
+    def autocorrelation(self) -> List[float]:
+        """Коэффициенты автокорреляции для сдвигов 1..max_lag (как calculate_autocorrelation)"""
+        max_lag = max(min(self.max_lag, self.count - 1), 0)
+        head_sum, head_sq, tail_sum, tail_sq = (sums[:max_lag] for sums in self._segment_sums(self.shift or 0.0))
+        m = self.count - np.arange(1, max_lag + 1)
+        
+        # Отрезок y[:-k] - все значения без последних k, y[k:] - без первых k
+        correlations = StatisticsCalculator._lagged_correlation(
+            self._products[:max_lag],
+            self._sum - tail_sum, self._sum - head_sum,
+            self._square_sum - tail_sq, self._square_sum - head_sq, m)
+        return correlations.tolist()
+    
+    def histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Частоты и границы интервалов гистограммы"""
+        if self.histogram_state is None:
+            raise ValueError("Интервалы гистограммы не заданы")
+        return self.histogram_state.counts, self.histogram_state.bin_edges
\ No newline at end of file
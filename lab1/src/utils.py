@@ -1,16 +1,103 @@
+import glob
+import itertools
+import os
+import re
+import sys
+import warnings
 import numpy as np
-import pandas as pd
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterator
 
-def read_data(file_path: str) -> np.ndarray:
-    """Чтение числовой последовательности из файла"""
+# Суффикс бинарного кэша, создаваемого рядом с исходным текстовым файлом
+CACHE_SUFFIX = '.cache.npy'
+# Ориентировочное число значений в одном блоке блочных расчетов (общий предел памяти
+# для реплик, скользящего окна и взаимной корреляции)
+BLOCK_VALUES = 2_000_000
+
+def _cache_path(file_path: str, file_stat: os.stat_result) -> str:
+    """Путь к кэшу, привязанный к размеру и времени изменения исходного файла"""
+    return f"{file_path}.{file_stat.st_size}-{file_stat.st_mtime_ns}{CACHE_SUFFIX}"
+
+def _parse_text(file_path: str) -> np.ndarray:
+    """Разбор текстового файла с числами, разделенными пробелами или переводами строк"""
+    with warnings.catch_warnings():
+        # В старых версиях numpy неразобранный остаток файла дает только предупреждение
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return np.fromfile(file_path, dtype=np.float64, sep=' ')
+        except (ValueError, DeprecationWarning) as e:
+            raise ValueError(f"Некорректные данные в файле {file_path}: {e}") from e
+
+def _write_cache(data: np.ndarray, cache_path: str, file_path: str):
+    """Сохранение кэша с удалением устаревших версий; ошибки записи не критичны"""
+    # Устаревшими считаются только кэши этого файла (суффикс .<размер>-<время>.cache.npy),
+    # но не кэши файлов с тем же префиксом имени, например numbers.txt.bak
+    stale_pattern = re.compile(re.escape(file_path) + r'\.\d+-\d+' + re.escape(CACHE_SUFFIX))
+    for stale_path in glob.glob(f"{glob.escape(file_path)}.*{CACHE_SUFFIX}"):
+        if stale_path != cache_path and stale_pattern.fullmatch(stale_path):
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+    
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as file:
+            np.save(file, data)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def read_data(file_path: str, use_cache: bool = True) -> np.ndarray:
+    """Чтение числовой последовательности из файла
+    
+    Текстовый файл разбирается целиком средствами numpy, результат сохраняется
+    в бинарный кэш рядом с файлом. При повторном чтении неизмененного файла
+    (тот же размер и время изменения) кэш отображается в память без разбора
+    и копирования. Файлы .npy читаются напрямую через отображение в память.
+    При ошибке чтения или разбора выбрасывается OSError или ValueError.
+    """
+    if file_path.endswith('.npy'):
+        return np.load(file_path, mmap_mode='r')
+    
+    file_stat = os.stat(file_path)
+    cache_path = _cache_path(file_path, file_stat)
+    
+    if use_cache and os.path.exists(cache_path):
+        try:
+            return np.load(cache_path, mmap_mode='r')
+        except (OSError, ValueError):
+            pass  # поврежденный кэш пересоздается
+    
+    data = _parse_text(file_path)
+    if use_cache:
+        _write_cache(data, cache_path, file_path)
+    return data
+
+def iter_data_chunks(file_path: str, chunk_size: int = 1_000_000) -> Iterator[np.ndarray]:
+    """Поблочное чтение числовой последовательности (по одному числу в строке)
+    
+    file_path '-' означает стандартный ввод. Память ограничена размером блока,
+    поэтому блоки можно передавать в StreamingStatistics.update.
+    """
+    file = sys.stdin if file_path == '-' else open(file_path, 'r')
     try:
-        with open(file_path, 'r') as file:
-            data = [float(line.strip()) for line in file if line.strip()]
-        return np.array(data)
-    except Exception as e:
-        print(f"Ошибка чтения файла: {e}")
-        return np.array([])
+        while True:
+            lines = list(itertools.islice(file, chunk_size))
+            if not lines:
+                break
+            text = ' '.join(lines)
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', DeprecationWarning)
+                try:
+                    chunk = np.fromstring(text, dtype=np.float64, sep=' ')
+                except (ValueError, DeprecationWarning) as e:
+                    raise ValueError(f"Некорректные данные в файле {file_path}: {e}") from e
+            # Блок отдается вне catch_warnings, чтобы фильтр не действовал на код вызывающего
+            yield chunk
+    finally:
+        if file is not sys.stdin:
+            file.close()
 
 def calculate_relative_deviation(values: List[float], reference: float) -> List[float]:
     """Расчет относительных отклонений от эталонного значения"""
@@ -1,35 +1,152 @@
-import matplotlib.pyplot as plt
+import os
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import Future
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from histogram import StreamingHistogram
+
+# Режимы вывода графиков: интерактивные окна, файлы без GUI, без графиков
+PLOT_MODES = ('show', 'save', 'off')
+
+def _pyplot(headless: bool):
+    """Отложенный импорт matplotlib: числовые запуски не тратят время на его загрузку"""
+    import matplotlib
+    if headless:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def _render_to_file(draw: Callable, path: str, args: tuple) -> str:
+    """Построение графика с неинтерактивным backend и сохранение в файл (в т.ч. в рабочем процессе)"""
+    plt = _pyplot(headless=True)
+    draw(plt, *args)
+    plt.savefig(path)
+    plt.close('all')
+    return path
+
+def _draw_sequence(plt, sequence: np.ndarray, title: str):
+    plt.figure(figsize=(12, 6))
+    plt.plot(sequence, 'b-', linewidth=0.8)
+    plt.title(title)
+    plt.xlabel('Индекс')
+    plt.ylabel('Значение')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+def _draw_autocorrelation(plt, autocorrelations: List[float], title: str, bound: Optional[float]):
+    plt.figure(figsize=(10, 6))
+    lags = range(1, len(autocorrelations) + 1)
+    plt.stem(lags, autocorrelations, basefmt=" ")
+    plt.axhline(y=0, color='r', linestyle='-', alpha=0.3)
+    if bound is not None:
+        plt.axhline(y=bound, color='r', linestyle='--', alpha=0.5)
+        plt.axhline(y=-bound, color='r', linestyle='--', alpha=0.5)
+    plt.title(title)
+    plt.xlabel('Сдвиг')
+    plt.ylabel('Коэффициент автокорреляции')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+def _draw_bins(plt, frequencies: np.ndarray, bin_edges: np.ndarray, **kwargs):
+    """Гистограмма по готовым частотам без повторного разбиения данных на интервалы"""
+    plt.bar(bin_edges[:-1], frequencies, width=np.diff(bin_edges), align='edge', edgecolor='black', **kwargs)
+
+def _draw_histogram(plt, frequencies: np.ndarray, bin_edges: np.ndarray, title: str):
+    plt.figure(figsize=(12, 6))
+    _draw_bins(plt, frequencies, bin_edges, alpha=0.7)
+    plt.title(title)
+    plt.xlabel('Интервалы значений')
+    plt.ylabel('Частота')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+def _draw_comparison(plt, original: Tuple[np.ndarray, np.ndarray], generated: Tuple[np.ndarray, np.ndarray]):
+    plt.figure(figsize=(14, 6))
+    
+    plt.subplot(1, 2, 1)
+    _draw_bins(plt, *original, alpha=0.7, color='blue')
+    plt.title('Исходная последовательность')
+    plt.xlabel('Значения')
+    plt.ylabel('Частота')
+    
+    plt.subplot(1, 2, 2)
+    _draw_bins(plt, *generated, alpha=0.7, color='green')
+    plt.title('Сгенерированная последовательность')
+    plt.xlabel('Значения')
+    plt.ylabel('Частота')
+    
+    plt.tight_layout()
 
 class Visualizer:
     """Класс для визуализации результатов"""
     
+    mode = 'show'
+    output_dir = 'plots'
+    _figure_index = 0
+    _executor = None  # ProcessPoolExecutor для построения графиков в рабочих процессах
+    _rendered: List = []  # пути сохраненных файлов или Future рабочих процессов
+    
+    @staticmethod
+    def configure(mode: str = 'show', output_dir: str = 'plots', workers: int = 0):
+        """Настройка вывода графиков
+        
+        mode: 'show' - интерактивные окна (plt.show), 'save' - сохранение в файлы
+        output_dir без GUI, 'off' - графики не строятся, matplotlib не загружается.
+        workers > 0 в режиме 'save' - построение графиков в рабочих процессах.
+        """
+        if mode not in PLOT_MODES:
+            raise ValueError(f"Неизвестный режим графиков: {mode}")
+        Visualizer.close()
+        Visualizer.mode = mode
+        Visualizer.output_dir = output_dir
+        Visualizer._figure_index = 0
+        if mode == 'save':
+            os.makedirs(output_dir, exist_ok=True)
+            if workers > 0:
+                from concurrent.futures import ProcessPoolExecutor
+                Visualizer._executor = ProcessPoolExecutor(max_workers=workers)
+    
+    @staticmethod
+    def close() -> List[str]:
+        """Ожидание построения графиков в рабочих процессах; возвращает пути сохраненных файлов"""
+        paths = [item.result() if isinstance(item, Future) else item for item in Visualizer._rendered]
+        Visualizer._rendered = []
+        if Visualizer._executor is not None:
+            Visualizer._executor.shutdown()
+            Visualizer._executor = None
+        return paths
+    
+    @staticmethod
+    def _render(draw: Callable, name: str, *args):
+        """Построение графика в соответствии с настроенным режимом"""
+        if Visualizer.mode == 'off':
+            return
+        
+        if Visualizer.mode == 'show':
+            plt = _pyplot(headless=False)
+            draw(plt, *args)
+            plt.show()
+            return
+        
+        Visualizer._figure_index += 1
+        path = os.path.join(Visualizer.output_dir, f"{Visualizer._figure_index:02d}_{name}.png")
+        if Visualizer._executor is not None:
+            Visualizer._rendered.append(Visualizer._executor.submit(_render_to_file, draw, path, args))
+        else:
+            Visualizer._rendered.append(_render_to_file(draw, path, args))
+    
     @staticmethod
     def plot_sequence(sequence: np.ndarray, title: str = "Числовая последовательность"):
         """Построение графика числовой последовательности"""
-        plt.figure(figsize=(12, 6))
-        plt.plot(sequence, 'b-', linewidth=0.8)
-        plt.title(title)
-        plt.xlabel('Индекс')
-        plt.ylabel('Значение')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.show()
+        Visualizer._render(_draw_sequence, 'sequence', np.asarray(sequence), title)
     
     @staticmethod
-    def plot_autocorrelation(autocorrelations: List[float], title: str = "Автокорреляционный анализ"):
-        """Построение графика автокорреляционной функции"""
-        plt.figure(figsize=(10, 6))
-        lags = range(1, len(autocorrelations) + 1)
-        plt.stem(lags, autocorrelations, basefmt=" ")
-        plt.axhline(y=0, color='r', linestyle='-', alpha=0.3)
-        plt.title(title)
-        plt.xlabel('Сдвиг')
-        plt.ylabel('Коэффициент автокорреляции')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.show()
+    def plot_autocorrelation(autocorrelations: List[float], title: str = "Автокорреляционный анализ",
+                             bound: Optional[float] = None):
+        """Построение графика автокорреляционной функции
+        
+        bound - граница значимости, отображается горизонтальными линиями ±bound
+        """
+        Visualizer._render(_draw_autocorrelation, 'autocorrelation', list(autocorrelations), title, bound)
     
     @staticmethod
     def calculate_histogram_intervals(sequence: np.ndarray, bins: int = 18) -> Tuple[np.ndarray, np.ndarray, List[Tuple[float, float, int]]]:
@@ -37,33 +154,28 @@ class Visualizer:
         min_val = np.min(sequence)
         max_val = np.max(sequence)
         
-        # Создание интервалов
-        bin_edges = np.linspace(min_val, max_val, bins + 1)
-        frequencies, _ = np.histogram(sequence, bins=bin_edges)
+        # Интервалы равной ширины между минимумом и максимумом
+        histogram = StreamingHistogram(bins, (min_val, max_val)).update(sequence)
+        left_bounds, right_bounds, frequencies = histogram.intervals()
         
-        # Формирование таблицы интервалов
-        intervals_table = []
-        for i in range(len(frequencies)):
-            left_bound = bin_edges[i]
-            right_bound = bin_edges[i + 1]
-            frequency = frequencies[i]
-            intervals_table.append((left_bound, right_bound, frequency))
+        # Таблица интервалов для печати
+        intervals_table = list(zip(left_bounds.tolist(), right_bounds.tolist(), frequencies.tolist()))
         
-        return frequencies, bin_edges, intervals_table
+        return frequencies, histogram.bin_edges, intervals_table
     
     @staticmethod
-    def plot_histogram(sequence: np.ndarray, bins: int = 18, title: str = "Гистограмма распределения частот"):
-        """Построение гистограммы распределения"""
-        frequencies, bin_edges, intervals_table = Visualizer.calculate_histogram_intervals(sequence, bins)
+    def plot_histogram(sequence: Optional[np.ndarray], bins: int = 18, title: str = "Гистограмма распределения частот",
+                       histogram: Optional[Tuple[np.ndarray, np.ndarray, List[Tuple[float, float, int]]]] = None):
+        """Построение гистограммы распределения
+        
+        histogram - готовый результат calculate_histogram_intervals; если задан,
+        данные повторно не разбиваются на интервалы (sequence может быть None)
+        """
+        if histogram is None:
+            histogram = Visualizer.calculate_histogram_intervals(sequence, bins)
+        frequencies, bin_edges, intervals_table = histogram
         
-        plt.figure(figsize=(12, 6))
-        n, bins, patches = plt.hist(sequence, bins=bin_edges, alpha=0.7, edgecolor='black')
-        plt.title(title)
-        plt.xlabel('Интервалы значений')
-        plt.ylabel('Частота')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.show()
+        Visualizer._render(_draw_histogram, 'histogram', frequencies, bin_edges, title)
         
         return frequencies, bin_edges, intervals_table
     
@@ -80,21 +192,15 @@ class Visualizer:
             print(f"{i:<3} {left:<15.4f} {right:<15.4f} {freq:<10}")
     
     @staticmethod
-    def plot_comparison_histograms(original: np.ndarray, generated: np.ndarray, bins: int = 18):
-        """Сравнение гистограмм исходной и сгенерированной последовательностей"""
-        plt.figure(figsize=(14, 6))
-        
-        plt.subplot(1, 2, 1)
-        plt.hist(original, bins=bins, alpha=0.7, edgecolor='black', color='blue')
-        plt.title('Исходная последовательность')
-        plt.xlabel('Значения')
-        plt.ylabel('Частота')
+    def plot_comparison_histograms(original: Optional[np.ndarray], generated: Optional[np.ndarray], bins: int = 18,
+                                   original_histogram: Optional[Tuple] = None, generated_histogram: Optional[Tuple] = None):
+        """Сравнение гистограмм исходной и сгенерированной последовательностей
         
-        plt.subplot(1, 2, 2)
-        plt.hist(generated, bins=bins, alpha=0.7, edgecolor='black', color='green')
-        plt.title('Сгенерированная последовательность')
-        plt.xlabel('Значения')
-        plt.ylabel('Частота')
+        *_histogram - готовые (частоты, границы, ...) для повторного использования
+        """
+        if original_histogram is None:
+            original_histogram = np.histogram(original, bins=bins)
+        if generated_histogram is None:
+            generated_histogram = np.histogram(generated, bins=bins)
         
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        Visualizer._render(_draw_comparison, 'comparison', tuple(original_histogram[:2]), tuple(generated_histogram[:2]))
\ No newline at end of file
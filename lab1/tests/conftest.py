@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Модули лабораторной лежат в src и импортируются по имени файла
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.modules.pop('statistics', None)  # стандартный модуль с тем же именем
@@ -0,0 +1,26 @@
+import numpy as np
+from batch import analyze_file, find_input_files
+from utils import read_data
+
+
+def test_binary_caches_are_not_batch_inputs(tmp_path):
+    for name in ('a.txt', 'b.txt'):
+        (tmp_path / name).write_text('1 2 3\n')
+        read_data(str(tmp_path / name))  # создает кэш рядом с файлом
+    (tmp_path / 'c.npy').write_bytes(b'')
+    
+    expected = [str(tmp_path / name) for name in ('a.txt', 'b.txt', 'c.npy')]
+    assert find_input_files(str(tmp_path)) == expected
+    assert find_input_files(str(tmp_path / '*')) == expected
+    assert find_input_files(str(tmp_path / 'a.txt*')) == expected[:1]
+
+
+def test_short_file_is_not_reported_as_full_ladder(tmp_path):
+    path = tmp_path / 'short.txt'
+    path.write_text('\n'.join(str(value) for value in np.random.default_rng(0).exponential(5, 50)))
+    
+    row, table = analyze_file(str(path), {'seed': 1})
+    assert row['status'] == 'ok', row['error']
+    assert (row['count'], row['reference_size']) == (50, 50)
+    assert row['skipped_sizes'] == '100 200 300'
+    assert table.sample_sizes.tolist() == [10, 20, 50]
@@ -0,0 +1,39 @@
+import os
+import numpy as np
+from cache import ResultCache
+
+
+def test_eviction_keeps_size_under_limit(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=50_000)
+    for i in range(20):
+        cache.put(ResultCache.key('data', 'stage', {'i': i}), np.zeros(1000) + i)
+        assert cache.size() <= cache.max_bytes
+    
+    # Последние записи остаются, самые старые вытеснены
+    assert np.array_equal(cache.get(ResultCache.key('data', 'stage', {'i': 19})), np.zeros(1000) + 19)
+    assert cache.get(ResultCache.key('data', 'stage', {'i': 0})) is None
+
+
+def test_overwrite_does_not_inflate_size(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10**6)
+    key = ResultCache.key('data', 'stage', {})
+    for _ in range(5):
+        cache.put(key, np.zeros(1000))
+    assert cache._total == cache.size()
+
+
+def test_entry_of_missing_module_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = ResultCache.key('data', 'stage', {})
+    path = cache._path(key)
+    os.makedirs(os.path.dirname(path))
+    # Запись с классом из несуществующего модуля
+    with open(path, 'wb') as file:
+        file.write(b'\x80\x04c' + b'missing_module_for_cache_test\nValue\n' + b'.')
+    
+    assert cache.get(key) is None
+    assert cache.misses == 1
+    assert not os.path.exists(path)
+    
+    cache.put(key, {'value': 1})
+    assert cache.get(key) == {'value': 1}
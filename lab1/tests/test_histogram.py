@@ -0,0 +1,35 @@
+import numpy as np
+from histogram import StreamingHistogram
+
+
+def test_fixed_range_counts_match_numpy_histogram():
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        data = rng.exponential(rng.uniform(0.1, 100), rng.integers(2, 200)) + rng.normal(0, 1000)
+        bins = int(rng.integers(1, 40))
+        histogram = StreamingHistogram(bins, (data.min(), data.max()))
+        histogram.update(data[:len(data) // 2]).update(data[len(data) // 2:])
+        
+        edges = histogram.bin_edges
+        assert edges[0] == data.min() and edges[-1] == data.max()
+        assert histogram.underflow == histogram.overflow == 0
+        assert histogram.counts.sum() == len(data)
+        assert np.array_equal(histogram.counts, np.histogram(data, bins=edges)[0])
+
+
+def test_values_outside_fixed_range_are_counted_separately():
+    histogram = StreamingHistogram(4, (0.0, 1.0)).update([-1.0, 0.0, 0.5, 1.0, 1.5, 2.0])
+    assert (histogram.underflow, histogram.overflow) == (1, 2)
+    assert histogram.counts.sum() == 3
+
+
+def test_adaptive_histogram_counts_every_value():
+    rng = np.random.default_rng(1)
+    histogram = StreamingHistogram(18)
+    data = rng.normal(0, 1, 10_000) * np.repeat([1, 10, 100, 1000], 2500)
+    for chunk in np.array_split(data, 17):
+        histogram.update(chunk)
+    
+    edges = histogram.bin_edges
+    assert histogram.counts.sum() == len(data)
+    assert edges[0] <= data.min() and data.max() <= edges[-1]
@@ -0,0 +1,21 @@
+import pytest
+from main import parse_args
+from utils import get_sample_sizes
+
+
+def test_sample_size_ladder_from_numbers_and_ranges():
+    assert parse_args([]).sample_sizes == get_sample_sizes()
+    assert parse_args(['--sample-sizes', '10', '100:300:100', '20', '100']).sample_sizes == [10, 100, 200, 300, 20]
+    assert parse_args(['--sample-sizes', '1:2000']).sample_sizes == list(range(1, 2001))
+
+
+@pytest.mark.parametrize('token', ['0', 'x', '5:1', '1:10:0', '1:2:3:4'])
+def test_invalid_sample_sizes_are_rejected(token):
+    with pytest.raises(SystemExit):
+        parse_args(['--sample-sizes', token])
+
+
+@pytest.mark.parametrize('arguments', [['--rolling', '1'], ['--rolling', '-5'], ['--rolling', '10', '--rolling-step', '0']])
+def test_invalid_rolling_arguments_are_rejected(arguments):
+    with pytest.raises(SystemExit):
+        parse_args(arguments)
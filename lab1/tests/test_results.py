@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from results import CharacteristicsTable
+
+
+def test_export_path_is_checked_before_writing(tmp_path):
+    with pytest.raises(ValueError):
+        CharacteristicsTable.check_export_path(str(tmp_path / 'table.xlsx'))
+    assert CharacteristicsTable.check_export_path(str(tmp_path / 'table.CSV')) == 'csv'
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.json'])
+def test_export_round_trip(tmp_path, extension):
+    table = CharacteristicsTable([10, 20], ['mean', 'variance'], np.array([[1.5, 0.1], [np.pi, 2.0]]),
+                                 source=['a,b', 'c'])
+    path = str(tmp_path / f"table{extension}")
+    table.export(path)
+    
+    loaded = CharacteristicsTable.load(path)
+    assert loaded.names == table.names
+    assert np.array_equal(loaded.sample_sizes, table.sample_sizes)
+    assert np.array_equal(loaded.values, table.values)
+    assert list(loaded.source) == list(table.source)
@@ -0,0 +1,56 @@
+import numpy as np
+from rolling import RollingStatistics, RollingWindow
+
+
+def level_shift_trace(size: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.concatenate((rng.normal(1e6, 1, size), rng.normal(2e6, 1, size)))
+
+
+def direct(data: np.ndarray, window: int, ends: np.ndarray):
+    windows = np.lib.stride_tricks.sliding_window_view(data, window)[ends - window]
+    return windows, windows.mean(axis=1), windows.var(axis=1, ddof=1)
+
+
+def test_rolling_statistics_match_direct_computation_after_level_shift():
+    data = level_shift_trace(20_000)
+    for window, step in [(2, 1), (100, 1), (100, 37), (1000, 5)]:
+        result = RollingStatistics.calculate(data, window, max_lag=3, step=step, block_values=7000)
+        windows, mean, variance = direct(data, window, result['end'])
+        
+        assert np.array_equal(result['end'], np.arange(window, len(data) + 1, step))
+        assert np.allclose(result['mean'], mean, rtol=1e-12)
+        assert np.allclose(result['variance'], variance, rtol=1e-8)
+        
+        for lag in range(1, min(3, window - 1) + 1):
+            if window - lag < 10:
+                continue
+            expected = [np.corrcoef(values[:-lag], values[lag:])[0, 1] for values in windows[::50]]
+            assert np.allclose(result['autocorrelation'][::50, lag - 1], expected, atol=1e-8)
+
+
+def test_rolling_window_matches_batch_calculation():
+    rng = np.random.default_rng(1)
+    for data, acf_tolerance in [(level_shift_trace(510, seed=1), None), (rng.exponential(5, 1000), 1e-9)]:
+        batch = RollingStatistics.calculate(data, 25, max_lag=2)
+        pushed = RollingWindow(25, max_lag=2)
+        for i, value in enumerate(data):
+            pushed.push(value)
+            if i + 1 < 25:
+                continue
+            assert np.isclose(pushed.mean, batch['mean'][i + 1 - 25], rtol=1e-12)
+            assert np.isclose(pushed.variance, batch['variance'][i + 1 - 25], rtol=1e-9)
+            if acf_tolerance is not None:
+                assert np.allclose(pushed.autocorrelation(), batch['autocorrelation'][i + 1 - 25], atol=acf_tolerance)
+
+
+def test_rolling_window_extend_returns_each_window_once():
+    data = np.random.default_rng(2).exponential(5, 100)
+    stream = RollingWindow(20, max_lag=2)
+    parts = [stream.extend(chunk) for chunk in np.split(data, [10, 25, 40, 41, 77])]
+    ends = np.concatenate([part['end'] for part in parts if part])
+    variance = np.concatenate([part['variance'] for part in parts if part])
+    
+    batch = RollingStatistics.calculate(data, 20, max_lag=2)
+    assert np.array_equal(ends, batch['end'])
+    assert np.allclose(variance, batch['variance'], rtol=1e-10)
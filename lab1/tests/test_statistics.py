@@ -0,0 +1,25 @@
+import numpy as np
+from statistics import StatisticsCalculator
+
+
+def test_prefix_characteristics_match_direct_computation_after_level_shift():
+    rng = np.random.default_rng(0)
+    data = np.concatenate((rng.normal(1e6, 1, 100_000), rng.normal(2e6, 1, 100_000)))
+    sizes = [1, 2, 10, 4095, 4096, 4097, 100_000, 100_005, 150_000, 200_000]
+    
+    result = StatisticsCalculator.calculate_prefix_characteristics(data, sizes)
+    
+    for i, n in enumerate(sizes):
+        assert np.isclose(result['mean'][i], data[:n].mean(), rtol=1e-12)
+        if n > 1:
+            assert np.isclose(result['variance'][i], np.var(data[:n], ddof=1), rtol=1e-9)
+
+
+def test_all_prefixes_match_direct_computation():
+    data = np.random.default_rng(1).exponential(5, 1000)
+    result = StatisticsCalculator.calculate_prefix_characteristics(data)
+    
+    expected = [np.var(data[:n], ddof=1) for n in range(2, len(data) + 1)]
+    assert np.isnan(result['variance'][0])
+    assert np.allclose(result['variance'][1:], expected, rtol=1e-10)
+    assert np.allclose(result['mean'], np.cumsum(data) / np.arange(1, len(data) + 1), rtol=1e-12)
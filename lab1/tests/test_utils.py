@@ -0,0 +1,25 @@
+import os
+import numpy as np
+from utils import read_data
+
+
+def test_read_data_keeps_caches_of_other_files(tmp_path):
+    path = tmp_path / 'numbers.txt'
+    backup = tmp_path / 'numbers.txt.bak'
+    path.write_text('1 2 3\n')
+    backup.write_text('4 5\n')
+    
+    assert np.array_equal(read_data(str(backup)), [4, 5])
+    backup_caches = [name for name in os.listdir(tmp_path) if name.startswith('numbers.txt.bak.')]
+    assert len(backup_caches) == 1
+    
+    assert np.array_equal(read_data(str(path)), [1, 2, 3])
+    assert backup_caches[0] in os.listdir(tmp_path)
+    
+    # Изменение файла заменяет его прежний кэш
+    path.write_text('1 2 3 4\n')
+    os.utime(path, ns=(1, 1))
+    assert np.array_equal(read_data(str(path)), [1, 2, 3, 4])
+    own_caches = [name for name in os.listdir(tmp_path)
+                  if name.startswith('numbers.txt.') and not name.startswith('numbers.txt.bak')]
+    assert len(own_caches) == 1